@@ -21,3 +21,18 @@ from .registry import InterfaceRegistry
 logger = logging.getLogger(__name__)
 
 interface_registry = InterfaceRegistry()
+
+# register interfaces (imported on first use)
+
+interface_registry.register(
+    "relation-app-config", "hpctinterfaces.relation:AppConfigRelationSuperInterface"
+)
+interface_registry.register(
+    "relation-app-secure-config", "hpctinterfaces.relation:AppSecureConfigRelationSuperInterface"
+)
+interface_registry.register(
+    "relation-app-ready", "hpctinterfaces.relation:AppReadyRelationSuperInterface"
+)
+interface_registry.register(
+    "relation-subordinate-ready", "hpctinterfaces.relation:SubordinateReadyRelationSuperInterface"
+)
@@ -10,6 +10,9 @@
 
 import json
 import logging
+import sys
+from contextlib import contextmanager
+from types import MappingProxyType
 from typing import Any
 
 
@@ -20,6 +23,19 @@ class AccessError(Exception):
     pass
 
 
+class BatchError(Exception):
+    """Error(s) from a batch operation (e.g., Codec.decode_many()).
+
+    The results hold None for failed items. The errors hold the
+    exception for each failed item, by index.
+    """
+
+    def __init__(self, results, errors):
+        super().__init__(f"{len(errors)} of {len(results)} items failed")
+        self.errors = errors
+        self.results = results
+
+
 class NoValue:
     def __str__(self):
         return "no value"
@@ -30,6 +46,81 @@ class NoValue:
 
 NoValue = NoValue()
 
+# shared (read-only) placeholder until something is mounted
+_NOMOUNTS = MappingProxyType({})
+
+# shared (read-only) placeholder until a packed interface is set up
+_NOPACKS = MappingProxyType({})
+
+
+def _dumps_packed(doc):
+    """Encode packed document (canonical, see Interface._packed)."""
+
+    return json.dumps(doc, separators=(",", ":"), sort_keys=True)
+
+
+def map_many(func, values, memo=True):
+    """Apply func to each of values and return list of results.
+
+    If memo is set, func is called only once for identical (hashable)
+    values, which then share the same result object.
+
+    Raises:
+        BatchError if func fails for any value, after all values.
+    """
+
+    results = []
+    errors = {}
+    cache = {} if memo else None
+
+    for i, value in enumerate(values):
+        try:
+            if cache != None:
+                try:
+                    result = cache[value]
+                except KeyError:
+                    result = cache[value] = func(value)
+            else:
+                result = func(value)
+        except Exception as e:
+            errors[i] = e
+            result = None
+        results.append(result)
+
+    if errors:
+        raise BatchError(results, errors)
+    return results
+
+
+def compile_codec(codec, checker=None, strict=False):
+    """Return (encode, decode) functions for codec and (optional)
+    checker, as compiled by codec.compile(). For a codec without
+    compile() (e.g., duck-typed), the functions use its
+    encode()/decode() and checker.check().
+    """
+
+    compile = getattr(codec, "compile", None)
+    if compile != None:
+        return compile(checker, strict)
+
+    _encode, _decode = codec.encode, codec.decode
+    if checker == None:
+        return _encode, _decode
+
+    check = checker.check
+
+    def encode(value):
+        raw = _encode(value)
+        check(value)
+        return raw
+
+    def decode(raw):
+        value = _decode(raw)
+        check(value)
+        return value
+
+    return encode, decode
+
 
 class Value:
     """Base descriptor for use with interfaces. The interface provides
@@ -39,20 +130,41 @@ class Value:
 
     The codec encodes (to string) and decodes (from string).
 
-    The default is return when there is no value set.
+    The default is returned when there is no value set. It is not
+    checked, so that it can stand for "unset" (e.g., "" for a value
+    which must be one of a list).
 
     The access is zero or combined "r"ead and "w"rite.
+
+    Encoding and decoding use functions compiled (see Codec.compile())
+    from the codec and checker, unless strict is set.
+
+    strict is taken when the Value is created (i.e., at interface class
+    definition), from the strict keyword argument or the class
+    attribute: set it for a Value, or for a Value subclass before the
+    interface classes using it are defined. Changing Value.strict later
+    does not affect existing values.
     """
 
+    _bulk_decode = None
     checker = None
     codec = None
     default = NoValue
+    strict = False
 
     def __init__(self, default=NoValue, checker=None, codec=None, **kwargs):
         self.checker = self.checker if checker == None else checker
         self.codec = self.codec if codec == None else codec
         self.default = self.default if default == NoValue else default
         self.access = kwargs.get("access", "rw")
+        self.strict = kwargs.get("strict", self.strict)
+
+        if self.codec != None:
+            # codecs without "mutable" (e.g., duck-typed) are taken as mutable
+            self._mutable = getattr(self.codec, "mutable", True)
+            self._encode, self._decode = compile_codec(self.codec, self.checker, self.strict)
+            if getattr(self.codec, "fastpath", False) and not self.strict:
+                self._bulk_decode = self.codec.bulk_decode
 
     def __get__(self, owner, objtype=None):
         """Return value (from owner)."""
@@ -62,15 +174,25 @@ class Value:
         if "r" not in self.access:
             raise AccessError("value not readable")
 
-        value = owner._get(self.name, NoValue)
-        if value == NoValue:
-            value = self.default
-        else:
-            value = self.codec.decode(value)
+        wirekey = owner._wirekeys[self.name]
+        raw = owner._rawget(wirekey, NoValue)
+        if raw is NoValue:
+            return self.default
+
+        # decoded values are cached (in the base interface) against
+        # the raw string they were decoded from
+        baseiface = owner._baseiface
+        cached = baseiface._cache.get(wirekey)
+        if cached is not None and cached[0] == raw:
+            baseiface._cache_hits += 1
+            return cached[1]
+        baseiface._cache_misses += 1
+
+        value = self.decode(raw)
 
-        # only check for non-NoValue values
-        if value != NoValue and self.checker:
-            self.checker.check(value)
+        # mutable values could be changed by the caller
+        if not self._mutable:
+            baseiface._cache[wirekey] = (raw, value)
 
         return value
 
@@ -83,15 +205,110 @@ class Value:
         if "w" not in self.access:
             raise AccessError("value not writable")
 
-        if self.checker:
-            self.checker.check(value)
-
-        value = self.codec.encode(value)
-        owner._set(self.name, value)
+        owner._rawset(owner._wirekeys[self.name], self._encode(value))
 
     def __set_name__(self, owner, name):
-        """Set name (mangle to put in owner)."""
+        """Set name (mangle to put in owner) and (relative) wire key."""
         self.name = name
+        self.wirekey = name.replace("_", "-")
+
+    def _decode_bulk(self, raws):
+        """Decode and check sequence of raw values with the bulk_decode
+        function of the codec (see Codec), mapped over the distinct
+        values at once. Raises the first error."""
+
+        distinct = set(raws)
+        distinct.discard(NoValue)
+        values = dict(zip(distinct, map(self._bulk_decode, distinct)))
+        if self.checker:
+            check = self.checker.check
+            for value in values.values():
+                check(value)
+        values[NoValue] = self.default
+        return [values[raw] for raw in raws]
+
+    def decode_many(self, raws):
+        """Decode and check sequence of raw (stored) values. See
+        decode().
+
+        Values of codecs which decode in bulk (see Codec) are decoded
+        together, and one by one only if any fails (for the errors).
+
+        Raises:
+            BatchError (see map_many()).
+        """
+
+        if self._bulk_decode != None:
+            try:
+                return self._decode_bulk(raws)
+            except Exception:
+                pass
+        return map_many(self.decode, raws, memo=not self._mutable)
+
+    def encode_many(self, values):
+        """Check and encode sequence of values.
+
+        Raises:
+            BatchError (see map_many()).
+        """
+
+        return map_many(self._encode, values, memo=False)
+
+    def decode(self, raw):
+        """Decode and check raw (stored) value. The default is returned
+        (unchecked) for NoValue."""
+
+        if raw is NoValue:
+            return self.default
+        return self._decode(raw)
+
+
+class Snapshot:
+    """Base class for read-only views of interface values. See
+    Interface.snapshot().
+
+    Subclasses are generated with __slots__ for the Value (and
+    sub-Interface) names of the interface.
+    """
+
+    __slots__ = ()
+
+    def __delattr__(self, name):
+        raise AccessError("snapshot is read-only")
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {self._asdict()}>"
+
+    def __setattr__(self, name, value):
+        raise AccessError("snapshot is read-only")
+
+    def _asdict(self):
+        """Return values as a dict (nested for sub-Interfaces)."""
+
+        d = {}
+        for k in self.__slots__:
+            v = getattr(self, k)
+            d[k] = v._asdict() if isinstance(v, Snapshot) else v
+        return d
+
+
+_snapshot_classes = {}
+
+
+def _get_snapshot_class(ifacecls, names):
+    """Return (cached) Snapshot subclass for an interface class and
+    (tuple of) value names."""
+
+    key = (ifacecls, names)
+    cls = _snapshot_classes.get(key)
+    if cls == None:
+        cls = type(
+            f"{ifacecls.__name__}Snapshot",
+            (Snapshot,),
+            {"__slots__": names, "__module__": ifacecls.__module__},
+        )
+        _snapshot_classes[key] = cls
+    return cls
 
 
 class Interface:
@@ -100,17 +317,71 @@ class Interface:
     A minimum number of methods, with specific names, are provided to
     avoid polluting the namespace. This allows clean integration with
     descriptors (from Value).
+
+    Instance state is held in __slots__. Subclasses which do not
+    define __slots__ get a __dict__, as usual.
+
+    In packed mode (_packed set to a key), the (writable) Values of the
+    interface, including those of sub-interfaces, are stored together,
+    as one (canonical) JSON document of raw values, under that key,
+    rather than each under its own key. Values are accessed as usual,
+    via a decoded view of the document (cached against the raw
+    document). Packing suits many small, related values; each write
+    rewrites the whole document, so writes should be batched (see
+    batch()).
     """
 
+    __slots__ = (
+        "_baseiface",
+        "_cache",
+        "_cache_hits",
+        "_cache_misses",
+        "_mounts",
+        "_packmap",
+        "_pending",
+        "_prefix",
+        "_store",
+        "_wirekeys",
+    )
+
+    # class-level index of Value descriptors and sub-Interfaces (by name),
+    # and of Value wire keys (by name), built once per subclass by
+    # __init_subclass__()
+    _schema = {}
+    _schema_wirekeys = {}
+
+    # packed mode key (relative to the interface), or None
+    _packed = None
+
     def __init__(self, *args, **kwargs):
-        self._basecls = (Value, Interface)
         self._baseiface = self
+        self._cache = {}
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._mounts = _NOMOUNTS
+        self._packmap = _NOPACKS
+        self._pending = None
         self._prefix = None
         self._store = {}
+        self._wirekeys = self._schema_wirekeys
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._build_schema()
 
     def __repr__(self):
         return f"<{self.__module__}.{self.__class__.__name__} keys ({self.get_keys()})>"
 
+    def __getattr__(self, name):
+        """Support for mounted sub-interfaces (see mount())."""
+
+        if name == "_mounts":
+            raise AttributeError(name)
+        try:
+            return self._mounts[name]
+        except KeyError:
+            raise AttributeError(name)
+
     def __contains__(self, key):
         """Support for "has"."""
         if hasattr(self.__class__, key):
@@ -135,45 +406,201 @@ class Interface:
     def __setitem__(self, key, value):
         self._set(key, value)
 
+    @classmethod
+    def _build_schema(cls):
+        """Build the class-level index of Value descriptors and
+        sub-Interfaces.
+
+        The index is sorted by name (as dir() is) so that key ordering
+        is unchanged."""
+
+        schema = {}
+        for k in dir(cls):
+            obj = getattr(cls, k, None)
+            if isinstance(obj, (Value, Interface)):
+                schema[k] = obj
+        cls._schema = schema
+        cls._schema_wirekeys = {k: v.wirekey for k, v in schema.items() if isinstance(v, Value)}
+
     def _get(self, key, default=None):
-        v = self._safe_getattr(key)
+        v = self._get_member(key)
         if isinstance(v, Interface):
             return v
-        else:
-            return self._baseiface._store.get(self.get_fqkey(key), default)
+        return self._rawget(self._get_wirekey(key), default)
+
+    def _get_all_wirekeys(self, access=None):
+        """Return wire keys of all Values, including subinterfaces.
+        Optionally, only of Values with access (e.g., "w")."""
+
+        wirekeys = []
+        for k, obj in self._get_members().items():
+            if obj is self or obj is self._baseiface:
+                continue
+            if isinstance(obj, Interface):
+                wirekeys.extend(obj._get_all_wirekeys(access))
+            elif access == None or access in obj.access:
+                wirekeys.append(self._wirekeys[k])
+        return wirekeys
 
     def _get_keys(self, iface, fq=False, depth=0):
         """Collect keys from an interface.
 
-        The keys of an interface are either from the class or the
-        instance.
+        The keys of an interface are either from the class (see
+        _schema) or the instance (see mount()).
 
         Args:
             fq: bool    record fully qualified key name if True
             depth: int  depth of search"""
 
         keys = []
-        for k in dir(iface):
-            key = k if not fq else iface.get_fqkey(k)
+        for k, obj in iface._get_members().items():
+            if obj is self or obj is self._baseiface:
+                # skip self (from self._baseiface)
+                continue
 
-            if hasattr(iface.__class__, k):
-                # catch descriptors
-                obj = getattr(iface.__class__, k)
+            if isinstance(obj, Interface) and depth > 0:
+                keys.extend(obj._get_keys(obj, fq, depth - 1))
             else:
-                obj = getattr(iface, k)
+                keys.append(k if not fq else iface.get_fqkey(k))
+        return keys
 
-            if obj in [self, self._baseiface]:
-                # skip self (from self._baseiface)
+    def _get_wirekey(self, key):
+        """Return (precomputed, if possible) wire key for key."""
+
+        wirekey = self._wirekeys.get(key)
+        return wirekey if wirekey != None else self.get_wirekey(key)
+
+    def _get_member(self, key):
+        """Return Value descriptor or sub-Interface for key, or None."""
+
+        v = self._mounts.get(key)
+        return v if v is not None else self._schema.get(key)
+
+    def _get_members(self):
+        """Return dict (by name) of Value descriptors and sub-Interfaces
+        of the class and mounted on the instance."""
+
+        if not self._mounts:
+            return self._schema
+        members = dict(self._schema)
+        members.update(self._mounts)
+        return dict(sorted(members.items()))
+
+    def _make_snapshot(self, raw):
+        """Make Snapshot object from dict of raw values (by fqkey)."""
+
+        members = {}
+        for k, obj in self._get_members().items():
+            if obj is self or obj is self._baseiface:
                 continue
+            if isinstance(obj, Interface):
+                members[k] = obj._make_snapshot(raw)
+            elif "r" in obj.access:
+                members[k] = obj.decode(raw.get(self._wirekeys[k], NoValue))
+
+        snapshot = object.__new__(_get_snapshot_class(self.__class__, tuple(members)))
+        for k, v in members.items():
+            object.__setattr__(snapshot, k, v)
+        return snapshot
+
+    def _get_packdoc(self, packedkey):
+        """Return decoded packed document (dict of raw values by key)
+        for packed (wire) key.
+
+        The document is cached (in the base interface cache) against
+        its raw value. Within a batch, a changed document is cached
+        against None, with None pending, until it is encoded (see
+        _pack_pending())."""
+
+        baseiface = self._baseiface
+        pending = baseiface._pending
+        if pending is not None and packedkey in pending:
+            raw = pending[packedkey]
+        else:
+            raw = baseiface._store.get(packedkey, NoValue)
+
+        cached = baseiface._cache.get(packedkey)
+        if cached is not None and cached[0] == raw:
+            return cached[1]
+
+        doc = json.loads(raw) if raw not in [NoValue, ""] else {}
+        baseiface._cache[packedkey] = (raw, doc)
+        return doc
+
+    def _pack_pending(self, pending):
+        """Encode changed packed documents into (dict of) pending
+        values."""
+
+        cache = self._baseiface._cache
+        for packedkey, value in pending.items():
+            if value is None:
+                doc = cache[packedkey][1]
+                raw = _dumps_packed(doc) if doc else NoValue
+                cache[packedkey] = (raw, doc)
+                pending[packedkey] = raw
+
+    def _packset(self, wirekey, value):
+        """Set (or, for NoValue, clear) raw value in its packed
+        document."""
+
+        baseiface = self._baseiface
+        baseiface._cache.pop(wirekey, None)
+        packedkey, key = baseiface._packmap[wirekey]
+        doc = self._get_packdoc(packedkey)
+        if value is NoValue:
+            doc.pop(key, None)
+        else:
+            doc[key] = value
 
-            if isinstance(obj, Value):
-                keys.append(key)
-            elif isinstance(obj, Interface):
-                if depth > 0:
-                    keys.extend(iface._get_keys(obj, depth - 1))
-                else:
-                    keys.append(key)
-        return keys
+        if baseiface._pending is not None:
+            baseiface._cache[packedkey] = (None, doc)
+            baseiface._pending[packedkey] = None
+        else:
+            raw = _dumps_packed(doc) if doc else NoValue
+            baseiface._cache[packedkey] = (raw, doc)
+            self._flush({packedkey: raw})
+
+    def _rawclear(self, wirekey):
+        """Clear raw value from the store."""
+
+        baseiface = self._baseiface
+        if baseiface._packmap and wirekey in baseiface._packmap:
+            self._packset(wirekey, NoValue)
+            return
+
+        baseiface._cache.pop(wirekey, None)
+        if baseiface._pending is not None:
+            baseiface._pending[wirekey] = NoValue
+        else:
+            del baseiface._store[wirekey]
+
+    def _rawget(self, wirekey, default=None):
+        """Get raw (encoded) value from the store."""
+
+        baseiface = self._baseiface
+        if baseiface._packmap and wirekey in baseiface._packmap:
+            packedkey, key = baseiface._packmap[wirekey]
+            return self._get_packdoc(packedkey).get(key, default)
+
+        if baseiface._pending is not None and wirekey in baseiface._pending:
+            # uncommitted write (see batch())
+            value = baseiface._pending[wirekey]
+            return default if value is NoValue else value
+        return baseiface._store.get(wirekey, default)
+
+    def _rawset(self, wirekey, value):
+        """Set raw (encoded) value in the store."""
+
+        baseiface = self._baseiface
+        if baseiface._packmap and wirekey in baseiface._packmap:
+            self._packset(wirekey, value)
+            return
+
+        baseiface._cache.pop(wirekey, None)
+        if baseiface._pending is not None:
+            baseiface._pending[wirekey] = value
+        else:
+            baseiface._store[wirekey] = value
 
     def _safe_getattr(self, k):
         try:
@@ -194,24 +621,89 @@ class Interface:
         # TODO: what if key refers to nothing in class/object?
         # * mount? if so, then what happens with the new values?
 
-        self._baseiface._store[self.get_fqkey(key)] = value
+        self._rawset(self._get_wirekey(key), value)
 
     def _set_base(self, baseiface):
-        """Set baseiface for all subinterfaces."""
+        """Set baseiface for all subinterfaces. Wire keys are computed
+        for the (new) prefix."""
 
         self._baseiface = baseiface
         prefix = "" if not self._prefix else f"{self._prefix}."
+        if prefix:
+            self._wirekeys = {k: self.get_wirekey(k) for k in self._schema_wirekeys}
+        else:
+            self._wirekeys = self._schema_wirekeys
 
-        for k in dir(self):
-            iface = self._safe_getattr(k)
-            if isinstance(iface, Interface) and iface != baseiface:
+        for k, iface in self._get_members().items():
+            if isinstance(iface, Interface) and iface is not baseiface:
                 iface._prefix = f"{prefix}{k}"
                 iface._set_base(baseiface)
 
+        if self._packed != None:
+            # after subinterfaces, so that an outer packed interface
+            # packs the values of inner ones
+            packedkey = self.get_wirekey(self._packed)
+            wireprefix = self.get_wirekey("")
+            if baseiface._packmap is _NOPACKS:
+                baseiface._packmap = {}
+            for wirekey in self._get_all_wirekeys("w"):
+                baseiface._packmap[wirekey] = (packedkey, wirekey[len(wireprefix) :])
+
+    def _flush(self, pending):
+        """Write (dict of) pending values to the store. A value of
+        NoValue deletes the key."""
+
+        store = self._baseiface._store
+        if isinstance(store, dict):
+            for wirekey, value in pending.items():
+                if value is NoValue:
+                    store.pop(wirekey, None)
+                else:
+                    store[wirekey] = value
+        else:
+            store.update(pending)
+
+    @contextmanager
+    def batch(self):
+        """Collect all writes to the interface (and subinterfaces) and
+        write them to the store in one update on exit.
+
+        If an exception is raised (e.g., by a checker) in the block,
+        none of the collected writes are made. Nested batches are part
+        of the outermost one.
+
+        Usage:
+        ```
+            with iface.batch():
+                iface.name = "slurm.conf"
+                iface.size = 1024
+        ```
+        """
+
+        baseiface = self._baseiface
+        if baseiface._pending is not None:
+            yield self
+            return
+
+        baseiface._pending = {}
+        try:
+            yield self
+        except BaseException:
+            for wirekey in baseiface._pending:
+                baseiface._cache.pop(wirekey, None)
+            raise
+        else:
+            if baseiface._pending:
+                if baseiface._packmap:
+                    self._pack_pending(baseiface._pending)
+                self._flush(baseiface._pending)
+        finally:
+            baseiface._pending = None
+
     def clear(self, key=None):
         """Clear one or all interface keys from storage."""
 
-        del self._baseiface._store[self.get_fqkey(key)]
+        self._rawclear(self._get_wirekey(key))
 
     def get_doc(self, show_values=False):
         """Return json object about interface."""
@@ -228,10 +720,7 @@ class Interface:
 
             for k in self.get_keys():
                 # TODO: call Value.get_doc()
-                if hasattr(self.__class__, k):
-                    v = getattr(self.__class__, k)
-                else:
-                    v = getattr(self, k)
+                v = self._get_member(k)
 
                 if isinstance(v, Interface):
                     values[k] = v.get_doc()
@@ -259,6 +748,12 @@ class Interface:
 
         return key if not self._prefix else f"{self._prefix}.{key}"
 
+    def get_wirekey(self, key):
+        """Return key as stored (e.g., in relation data): fully
+        qualified, with "_" replaced by "-"."""
+
+        return self.get_fqkey(key).replace("_", "-")
+
     def get_keys(self):
         """Get keys of all descriptors for this interface.
 
@@ -276,6 +771,30 @@ class Interface:
 
         return [(k, getattr(self, k)) for k in self._get_keys(self)]
 
+    def get_stats(self):
+        """Return counters for the interface (shared by subinterfaces)
+        and, if enabled, instrumentation stats (see instrument.py)."""
+
+        baseiface = self._baseiface
+        stats = {
+            "cache": {
+                "hits": baseiface._cache_hits,
+                "misses": baseiface._cache_misses,
+                "size": len(baseiface._cache),
+            },
+        }
+
+        store_stats = getattr(baseiface._store, "stats", None)
+        if store_stats != None:
+            stats["store"] = dict(store_stats)
+
+        # only if instrumentation (see instrument.py) is in use
+        instrument = sys.modules.get("hpctinterfaces.instrument")
+        if instrument != None and instrument.is_enabled():
+            stats["instrument"] = instrument.get_interface_stats(self)
+
+        return stats
+
     def is_ready(self):
         """Return if the interface is ready."""
 
@@ -286,7 +805,8 @@ class Interface:
         relative to this interface (subinterfaces hang off of
         interfaces not the store).
 
-        Note: Added as an instance member *not* a class member.
+        Note: Added as an instance member *not* a class member. Mounted
+        sub-interfaces are accessed as attributes via __getattr__().
 
         Q. Should this be added as a class member?
         A. Only if it should be inherited by all instances.
@@ -299,7 +819,9 @@ class Interface:
             prefix = "" if not self._prefix else f"{self._prefix}."
             subiface._prefix = f"{prefix}{key}"
             subiface._set_base(self._baseiface)
-            setattr(self, key, subiface)
+            if self._mounts is _NOMOUNTS:
+                self._mounts = {}
+            self._mounts[key] = subiface
 
             # TODO: what about the values, if any, in the mounted Interface?
             # * should it be mounted as if empty?
@@ -309,11 +831,46 @@ class Interface:
 
         json.dumps(self.get_doc(), indent)
 
+    def snapshot(self):
+        """Return read-only Snapshot of all (readable) values, decoded.
+
+        The store is read once, for all keys, so the snapshot can be
+        used without further access to the store (e.g., relation data).
+        """
+
+        baseiface = self._baseiface
+        wirekeys = self._get_all_wirekeys()
+
+        packmap = baseiface._packmap
+        if packmap:
+            packed = [wirekey for wirekey in wirekeys if wirekey in packmap]
+            wirekeys = [wirekey for wirekey in wirekeys if wirekey not in packmap]
+
+        store = baseiface._store
+        if isinstance(store, dict):
+            raw = {wirekey: store.get(wirekey, NoValue) for wirekey in wirekeys}
+        else:
+            raw = store.get_many(wirekeys)
+
+        if baseiface._pending:
+            raw.update(baseiface._pending)
+
+        if packmap:
+            # from the (cached) packed documents
+            for wirekey in packed:
+                raw[wirekey] = self._rawget(wirekey, NoValue)
+
+        return self._make_snapshot(raw)
+
     def update(self, d):
-        """Update multiple items from a dict."""
+        """Update multiple items from a dict (in one batch)."""
+
+        with self.batch():
+            for k, v in d.items():
+                self._set(k, v)
 
-        for k, v in d.items():
-            self._set(k, v)
+
+Interface._basecls = (Value, Interface)
 
 
 class BaseInterface(Interface):
@@ -321,6 +878,8 @@ class BaseInterface(Interface):
     There should only be one BaseInteface in an Interface object with embedded
     interfaces, namely, the most "base" one."""
 
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__()
         self._set_base(self)
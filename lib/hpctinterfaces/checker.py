@@ -9,6 +9,15 @@
 A checker is not a substitue for a dedicated Value but a way to
 check that a value meets specific constraints. A checker should be
 general enough to be reused.
+
+A checker has a predicate (value -> bool), specialized for its
+parameters when it is set up, which check() uses; check() raises
+CheckError on failure. Checkers are combined with AllOf, AnyOf and
+Not into a single predicate.
+
+The result of a checker which only depends on the value (memoize) is
+remembered, per Value, for raw (encoded) values which passed (see
+make_raw_check()).
 """
 
 
@@ -16,6 +25,9 @@ import re
 from typing import Any, List, Union
 from urllib.parse import urlparse
 
+# raw values remembered (per Value) as passed
+MEMO_SIZE = 1024
+
 
 class CheckError(Exception):
     pass
@@ -24,14 +36,37 @@ class CheckError(Exception):
 class Checker:
     """Holds parameters and provides a check() to check/validate a
     given value.
+
+    Subclasses provide a specialized predicate (see _compile()) and a
+    check() based on it, or only a check() (which raises CheckError or
+    returns False on failure).
     """
 
-    def __init__(self):
-        self.params = {}
+    __slots__ = ("params", "predicate")
+
+    # result depends only on the value (and parameters)
+    memoize = False
+
+    def __init__(self, **params):
+        self.params = params
+        self.predicate = self._compile()
 
     def __repr__(self):
         return f"<{self.__module__}.{self.__class__.__name__} params ({self.params})>"
 
+    def _compile(self):
+        """Return predicate (value -> bool), based on check()."""
+
+        check = self.check
+
+        def predicate(value):
+            try:
+                return check(value) is not False
+            except CheckError:
+                return False
+
+        return predicate
+
     def check(self, value):
         """Return if the value check passes or not."""
 
@@ -50,98 +85,261 @@ class Checker:
         return d
 
 
-class IntegerRange(Checker):
+def make_raw_check(checker, check=None, memo_size=MEMO_SIZE):
+    """Return check(value, raw) function for checker.
+
+    For a checker with memoize set, raw (encoded) values which passed
+    are remembered (up to memo_size, then forgotten all at once), and
+    are not checked again.
+
+    Args:
+        checker: Checker.
+        check: Check function (default is checker.check).
+        memo_size: Maximum number of raw values to remember.
+    """
+
+    check = check or checker.check
+
+    if not checker.memoize or not memo_size:
+
+        def raw_check(value, raw):
+            check(value)
+
+        return raw_check
+
+    passed = set()
+
+    def raw_check(value, raw):
+        if raw in passed:
+            return
+        check(value)
+        if len(passed) >= memo_size:
+            passed.clear()
+        passed.add(raw)
+
+    return raw_check
+
+
+class AllOf(Checker):
+    """Check that value passes all of the checkers."""
+
+    __slots__ = ("checkers",)
+
+    def __init__(self, *checkers: Checker):
+        self.checkers = checkers
+        super().__init__(checkers=[checker.get_doc() for checker in checkers])
+
+    @property
+    def memoize(self):
+        return all(checker.memoize for checker in self.checkers)
+
+    def _compile(self):
+        predicates = [checker.predicate for checker in self.checkers]
+        if len(predicates) == 0:
+            return lambda value: True
+        elif len(predicates) == 1:
+            return predicates[0]
+        elif len(predicates) == 2:
+            p0, p1 = predicates
+            return lambda value: p0(value) and p1(value)
+        return lambda value: all(p(value) for p in predicates)
+
+    def check(self, value: Any):
+        """Check value against all checkers. The CheckError is that
+        of the first checker failed."""
+
+        if self.predicate(value):
+            return True
+        for checker in self.checkers:
+            if checker.check(value) is False:
+                break
+        raise CheckError(f"value fails check ({checker.__class__.__name__})")
+
+
+class AnyOf(Checker):
+    """Check that value passes any of the checkers."""
+
+    __slots__ = ("checkers",)
+
+    def __init__(self, *checkers: Checker):
+        self.checkers = checkers
+        super().__init__(checkers=[checker.get_doc() for checker in checkers])
+
+    @property
+    def memoize(self):
+        return all(checker.memoize for checker in self.checkers)
+
+    def _compile(self):
+        predicates = [checker.predicate for checker in self.checkers]
+        if len(predicates) == 1:
+            return predicates[0]
+        elif len(predicates) == 2:
+            p0, p1 = predicates
+            return lambda value: p0(value) or p1(value)
+        return lambda value: any(p(value) for p in predicates)
+
+    def check(self, value: Any):
+        """Check value against checkers, until one passes."""
+
+        if not self.predicate(value):
+            raise CheckError("value fails all checks")
+        return True
+
+
+class Not(Checker):
+    """Check that value fails the checker."""
+
+    __slots__ = ("checker",)
+
+    def __init__(self, checker: Checker):
+        self.checker = checker
+        super().__init__(checker=checker.get_doc())
+
+    @property
+    def memoize(self):
+        return self.checker.memoize
+
+    def _compile(self):
+        predicate = self.checker.predicate
+        return lambda value: not predicate(value)
+
+    def check(self, value: Any):
+        """Check that value fails checker."""
+
+        if not self.predicate(value):
+            raise CheckError(f"value passes check ({self.checker.__class__.__name__})")
+        return True
+
+
+class _Range(Checker):
     """Check for value within range [lo, hi].
 
     Note: lo/hi of None indicates no bound.
     """
 
-    def __init__(self, lo: Union[int, None], hi: Union[int, None]):
-        super().__init__()
-        self.params.update(
-            {
-                "lo": lo,
-                "hi": hi,
-            }
-        )
-
-    def check(self, value: int):
-        """Check value against lo and hi parameters."""
+    __slots__ = ()
+
+    memoize = True
+
+    def __init__(self, lo, hi):
+        super().__init__(lo=lo, hi=hi)
 
+    def _compile(self):
         lo = self.params["lo"]
         hi = self.params["hi"]
 
-        if lo != None and value < lo:
+        if lo == None and hi == None:
+            return lambda value: True
+        elif lo == None:
+            return lambda value: value <= hi
+        elif hi == None:
+            return lambda value: value >= lo
+        return lambda value: lo <= value <= hi
+
+    def check(self, value):
+        """Check value against lo and hi parameters."""
+
+        if self.predicate(value):
+            return True
+        if self.params["lo"] != None and value < self.params["lo"]:
             raise CheckError("value is below range")
-        if hi != None and value > hi:
+        if self.params["hi"] != None and value > self.params["hi"]:
             raise CheckError("value is above range")
-        return True
+        raise CheckError("value is not in range")
 
 
-class FloatRange(Checker):
+class IntegerRange(_Range):
     """Check for value within range [lo, hi].
 
     Note: lo/hi of None indicates no bound.
     """
 
-    def __init__(self, lo: Union[float, None], hi: Union[float, None]):
-        super().__init__()
-        self.params.update(
-            {
-                "lo": lo,
-                "hi": hi,
-            }
-        )
-
-    def check(self, value: float):
-        """Check value against lo and hi parameters."""
+    __slots__ = ()
 
-        lo = self.params["lo"]
-        hi = self.params["hi"]
+    def __init__(self, lo: Union[int, None], hi: Union[int, None]):
+        super().__init__(lo, hi)
 
-        if lo != None and value < lo:
-            raise CheckError("value is below range")
-        if hi != None and value > hi:
-            raise CheckError("value is above range")
-        return True
+
+class FloatRange(_Range):
+    """Check for value within range [lo, hi].
+
+    Note: lo/hi of None indicates no bound.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, lo: Union[float, None], hi: Union[float, None]):
+        super().__init__(lo, hi)
 
 
 class OneOf(Checker):
-    """Check for value to match one of a list of values."""
+    """Check for value to match one of a list of values.
+
+    Membership is checked against a set, if the values are hashable.
+    """
+
+    __slots__ = ()
+
+    memoize = True
 
     def __init__(self, values: List[Any]):
-        super().__init__()
         if type(values) != list:
             raise CheckError("values must be a list")
-        self.params["values"] = values
+        super().__init__(values=values)
+
+    def _compile(self):
+        try:
+            members = frozenset(self.params["values"])
+        except TypeError:
+            members = self.params["values"]
+
+        def predicate(value):
+            try:
+                return value in members
+            except TypeError:
+                # unhashable value
+                return False
+
+        return predicate
 
     def check(self, value: Any):
-        return value in self.params["values"]
+        """Check value is one of values."""
+
+        if not self.predicate(value):
+            raise CheckError("value is not one of values")
+        return True
 
 
 class Regexp(Checker):
     """Check that string value is matched by regular expression."""
 
+    __slots__ = ("cregexp", "regexp")
+
+    memoize = True
+
     def __init__(self, regexp: str):
         """Setup.
 
-        Delay compilation of regular expression to check(). Also,
-        delays regexp validation check, too.
+        The regular expression is compiled (and validated) here.
         """
 
-        super().__init__()
         self.regexp = regexp
-        self.cregexp = None
+        try:
+            self.cregexp = re.compile(regexp)
+        except:
+            raise CheckError("bad regular expression")
+        super().__init__(regexp=regexp)
+
+    def _compile(self):
+        match = self.cregexp.match
+        return lambda value: match(value) != None
 
     def check(self, value: str):
         """Check value against regular expression."""
 
-        if self.cregexp == None:
-            try:
-                self.cregexp = re.compile(self.regexp)
-            except:
-                raise CheckError("bad regular expression")
-        return self.cregexp.match(value)
+        if not self.predicate(value):
+            raise CheckError("value does not match regular expression")
+        return True
 
 
 class URL(Checker):
@@ -149,8 +347,23 @@ class URL(Checker):
     TODO: This approach is (embarrassingly) rudimentary. It can be
     improved to provide stronger validation/checking."""
 
+    __slots__ = ()
+
+    memoize = True
+
+    def _compile(self):
+        def predicate(value):
+            try:
+                res = urlparse(value)
+            except (AttributeError, TypeError, ValueError):
+                return False
+            return bool(res.scheme and res.netloc)
+
+        return predicate
+
     def check(self, value: str):
         """Check value URL format."""
 
-        res = urlparse(str)
-        return all([res.scheme, res.netloc])
+        if not self.predicate(value):
+            raise CheckError("value is not a URL")
+        return True
@@ -11,15 +11,128 @@ must passgit the test of ```value == decode(encode(value))```.
 
 
 import base64
+import importlib
 import json
 import logging
+import zlib
 from typing import Any
 
+from ..base import map_many
+from ..checker import MEMO_SIZE, make_raw_check
+
 
 NoneType = type(None)
 logger = logging.getLogger(__name__)
 
 
+# orjson output (with digits as 0, see _JSON_DIGITS) which json writes
+# differently: floats with an exponent (e.g., orjson 1e16, 0.00001;
+# json 1e+16, 1e-05), NaN/Infinity (orjson null) and DEL (escaped by
+# json)
+_JSON_DIGITS = bytes.maketrans(b"123456789", b"000000000")
+_JSON_NONCANONICAL = [b"0e", b".0000", b"null", b"\x7f"]
+
+
+def _stdlib_dumps_canonical(value):
+    """Encode value as canonical JSON (sorted keys, compact separators)."""
+
+    return json.dumps(value, separators=(",", ":"), sort_keys=True)
+
+
+def _make_orjson_dumps_canonical(orjson):
+    """Return canonical encoding function (see Json) which uses orjson
+    where its output is that of json (stdlib), and json otherwise."""
+
+    canonical_option = (
+        orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
+    )
+
+    def dumps_canonical(value):
+        try:
+            raw = orjson.dumps(value, option=canonical_option)
+        except TypeError:
+            # e.g., non-string keys, integers over 64 bits, and types
+            # which json does not support (passed through)
+            return _stdlib_dumps_canonical(value)
+
+        # json escapes non-ASCII characters (ensure_ascii), and writes
+        # some values differently: use it for those (or lookalikes in
+        # strings)
+        if not raw.isascii():
+            return _stdlib_dumps_canonical(value)
+        digits = raw.translate(_JSON_DIGITS)
+        if any(s in digits for s in _JSON_NONCANONICAL):
+            return _stdlib_dumps_canonical(value)
+        return raw.decode("ascii")
+
+    return dumps_canonical
+
+
+def _make_orjson_backend(orjson):
+    """Return (loads, dumps, dumps_canonical) using orjson."""
+
+    def loads(s):
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            return json.loads(s)
+
+    def dumps(value):
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            return json.dumps(value)
+
+    return loads, dumps, _make_orjson_dumps_canonical(orjson)
+
+
+def _make_ujson_backend(ujson):
+    """Return (loads, dumps, dumps_canonical) using ujson. Canonical
+    encoding is done by json (ujson formats floats differently)."""
+
+    def loads(s):
+        try:
+            return ujson.loads(s)
+        except ujson.JSONDecodeError:
+            return json.loads(s)
+
+    def dumps(value):
+        try:
+            return ujson.dumps(value, escape_forward_slashes=False)
+        except (OverflowError, TypeError):
+            return json.dumps(value)
+
+    return loads, dumps, _stdlib_dumps_canonical
+
+
+# JSON backends, fastest first: (module name, function returning
+# (loads, dumps, dumps_canonical) for the module)
+_JSON_BACKENDS = [
+    ("orjson", _make_orjson_backend),
+    ("ujson", _make_ujson_backend),
+]
+
+
+def _get_json_backend():
+    """Return (name, loads, dumps, dumps_canonical) for the fastest
+    installed JSON backend (see _JSON_BACKENDS), or json (stdlib).
+
+    Values which the accelerated backends do not support (e.g.,
+    integers over 64 bits, NaN) are handled by json, and canonical
+    encodings are the same as those of json, whichever the backend."""
+
+    for name, make_backend in _JSON_BACKENDS:
+        try:
+            module = importlib.import_module(name)
+        except ImportError:
+            continue
+        return (name, *make_backend(module))
+    return "json", json.loads, json.dumps, _stdlib_dumps_canonical
+
+
+JSON_BACKEND, _json_loads, _json_dumps, _json_dumps_canonical = _get_json_backend()
+
+
 class EncodingError(Exception):
     pass
 
@@ -32,14 +145,113 @@ class ValueError(Exception):
     pass
 
 
+def _compile_checked(_encode, _decode, check):
+    """Return (encode, decode) functions with the raw value check
+    (see Codec.compile())."""
+
+    def encode(value):
+        raw = _encode(value)
+        check(value, raw)
+        return raw
+
+    def decode(raw):
+        value = _decode(raw)
+        check(value, raw)
+        return value
+
+    return encode, decode
+
+
+def _make_check_type(types):
+    """Return function raising the error for a value not of types."""
+
+    def check_type(value):
+        raise ValueError(f'value type "{type(value)}" not one of "{types}"')
+
+    return check_type
+
+
+def _compile_typed(_encode, _decode, types):
+    """Return (encode, decode) functions with the type check (see
+    Codec.compile())."""
+
+    typeset = frozenset(types)
+    check_type = _make_check_type(types)
+
+    def encode(value):
+        if type(value) not in typeset:
+            check_type(value)
+        return _encode(value)
+
+    def decode(value):
+        value = _decode(value)
+        if type(value) not in typeset:
+            check_type(value)
+        return value
+
+    return encode, decode
+
+
+def _compile_typed_checked(_encode, _decode, types, check):
+    """Return (encode, decode) functions with the type and raw value
+    checks (see Codec.compile())."""
+
+    typeset = frozenset(types)
+    check_type = _make_check_type(types)
+
+    def encode(value):
+        if type(value) not in typeset:
+            check_type(value)
+        raw = _encode(value)
+        check(value, raw)
+        return raw
+
+    def decode(raw):
+        value = _decode(raw)
+        if type(value) not in typeset:
+            check_type(value)
+        check(value, raw)
+        return value
+
+    return encode, decode
+
+
 class Codec:
-    """Base class for codecs."""
+    """Base class for codecs.
+
+    Decoded values of a codec which is not mutable may be cached and
+    shared between readers.
 
+    A fastpath codec does all of its work in _encode()/_decode() (with
+    type checks against types), so that compile() can replace
+    encode()/decode(). fastpath is not inherited by a subclass which
+    overrides encode() or decode() (unless it sets fastpath itself), so
+    that the override is used.
+
+    A fastpath codec may also set bulk_decode to a function (e.g., a
+    builtin) which does all of the work of _decode(), so that values
+    can be decoded in bulk (see Value.decode_many()). It is not
+    inherited by a subclass which overrides _decode().
+    """
+
+    __slots__ = ("params",)
+
+    bulk_decode = None
+    fastpath = False
+    mutable = False
     types = None
 
     def __init__(self, *args, **kwargs):
         self.params = {}
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        overrides = "encode" in cls.__dict__ or "decode" in cls.__dict__
+        if overrides and "fastpath" not in cls.__dict__:
+            cls.fastpath = False
+        if "_decode" in cls.__dict__ and "bulk_decode" not in cls.__dict__:
+            cls.bulk_decode = None
+
     def __repr__(self):
         return f"<{self.__module__}.{self.__class__.__name__})>"
 
@@ -71,6 +283,58 @@ class Codec:
                 e = ValueError(f'value type "{type(value)}" not one of "{types}"')
             raise e
 
+    def compile(self, checker=None, strict=False):
+        """Return specialized (encode, decode) functions, including the
+        (optional) checker.
+
+        The compiled functions check the type of the value to encode
+        and the decoded value, but trust that a raw value is a string
+        and that the codec encodes to a string. In strict mode, or for
+        codecs which are not fastpath, encode()/decode() are used, with
+        all checks.
+
+        The checker is applied after encoding (and decoding), so that
+        raw values which passed can be remembered and not checked
+        again (see checker.make_raw_check()), except in strict mode.
+
+        Args:
+            checker: Checker for encode input/decode output.
+            strict: Use encode()/decode().
+        Returns:
+            (encode, decode) functions.
+        """
+
+        check = None
+        if checker:
+            check = make_raw_check(checker, memo_size=0 if strict else MEMO_SIZE)
+
+        if strict or not self.fastpath:
+            _encode, _decode = self.encode, self.decode
+            types = None
+        else:
+            _encode, _decode = self._encode, self._decode
+            types = self.types
+
+        if types == None:
+            if check == None:
+                return _encode, _decode
+            return _compile_checked(_encode, _decode, check)
+        elif check == None:
+            return _compile_typed(_encode, _decode, types)
+        return _compile_typed_checked(_encode, _decode, types, check)
+
+    def decode_many(self, values: list) -> list:
+        """Decode sequence of string values.
+
+        Identical strings are decoded once, and share the decoded
+        object, unless the codec is mutable.
+
+        Raises:
+            BatchError if any value fails, with the results for all.
+        """
+
+        return map_many(self.decode, values, memo=not self.mutable)
+
     def decode(self, value: str) -> Any:
         """Decode string value to typed result.
 
@@ -88,6 +352,15 @@ class Codec:
         self.check_type(value, self.types)
         return value
 
+    def encode_many(self, values: list) -> list:
+        """Encode sequence of values.
+
+        Raises:
+            BatchError if any value fails, with the results for all.
+        """
+
+        return map_many(self.encode, values, memo=False)
+
     def encode(self, value) -> str:
         """Encode typed value to a string.
 
@@ -121,6 +394,9 @@ class Codec:
 class Blob(Codec):
     """Blob (byte-string)."""
 
+    __slots__ = ()
+
+    fastpath = True
     types = [bytes]
 
     def _decode(self, value: str) -> bytes:
@@ -139,6 +415,9 @@ class Blob(Codec):
 class Boolean(Codec):
     """Boolean: True, False."""
 
+    __slots__ = ()
+
+    fastpath = True
     types = [bool]
 
     def _decode(self, value: str) -> Any:
@@ -164,9 +443,71 @@ class Boolean(Codec):
         return super().encode(value)
 
 
+class CompressedBlob(Blob):
+    """Blob (byte-string), compressed (zlib or lzma) when it pays off.
+
+    Values of at least threshold bytes are compressed and, if smaller,
+    encoded with a "<method>:" header ("z:" zlib, "x:" lzma). Other
+    values are encoded as for Blob. Both forms are decoded, so Blob
+    encoded values can be read, too.
+    """
+
+    __slots__ = ()
+
+    HEADERS = {"lzma": "x", "zlib": "z"}
+    METHODS = {"x": "lzma", "z": "zlib"}
+
+    def __init__(self, method: str = "zlib", threshold: int = 1024, level=None):
+        super().__init__()
+        if method not in self.HEADERS:
+            raise ParameterError(f"unknown compression method ({method})")
+        self.params.update(
+            {
+                "level": level,
+                "method": method,
+                "threshold": threshold,
+            }
+        )
+
+    def _compress(self, value: bytes) -> bytes:
+        level = self.params["level"]
+        if self.params["method"] == "zlib":
+            return zlib.compress(value, -1 if level == None else level)
+        else:
+            import lzma
+
+            return lzma.compress(value, preset=level)
+
+    def _decode(self, value: str) -> bytes:
+        if value[1:2] != ":":
+            return base64.b85decode(value.encode("utf-8"))
+
+        method = self.METHODS.get(value[0])
+        data = base64.b85decode(value[2:].encode("utf-8"))
+        if method == "zlib":
+            return zlib.decompress(data)
+        elif method == "lzma":
+            import lzma
+
+            return lzma.decompress(data)
+        raise EncodingError(f"unknown compression header ({value[:2]})")
+
+    def _encode(self, value: bytes) -> str:
+        if len(value) >= self.params["threshold"]:
+            compressed = self._compress(value)
+            if len(compressed) < len(value):
+                header = self.HEADERS[self.params["method"]]
+                return f"{header}:{base64.b85encode(compressed).decode('utf-8')}"
+        return base64.b85encode(value).decode("utf-8")
+
+
 class Float(Codec):
     """Float."""
 
+    __slots__ = ()
+
+    bulk_decode = staticmethod(float)
+    fastpath = True
     types = [float]
 
     def _decode(self, value: str) -> float:
@@ -185,6 +526,10 @@ class Float(Codec):
 class Integer(Codec):
     """Integer."""
 
+    __slots__ = ()
+
+    bulk_decode = staticmethod(int)
+    fastpath = True
     codec_types = [int]
 
     def _decode(self, value: str) -> int:
@@ -206,15 +551,33 @@ class Json(Codec):
     This codec works for dicts in general except for:
     * basic types
     * non-string keys
+
+    In canonical mode, the encoding has sorted keys and compact
+    separators, so that equal values always encode identically (and
+    do not show up as changes). It is that of json (stdlib), so that it
+    does not depend on the backend installed, but is done by orjson,
+    if installed, when the output is the same.
+    Otherwise, the JSON_BACKEND (orjson, ujson or json, whichever is
+    installed) is used.
     """
 
+    __slots__ = ()
+
+    fastpath = True
+    mutable = True
     types = [dict]
 
+    def __init__(self, canonical: bool = False):
+        super().__init__()
+        self.params["canonical"] = canonical
+
     def _decode(self, value: str) -> dict:
-        return json.loads(value)
+        return _json_loads(value)
 
     def _encode(self, value: dict) -> str:
-        return json.dumps(value)
+        if self.params["canonical"]:
+            return _json_dumps_canonical(value)
+        return _json_dumps(value)
 
     def decode(self, value: str) -> dict:
         return super().decode(value)
@@ -226,6 +589,10 @@ class Json(Codec):
 class Noop(Codec):
     """Noop / no change."""
 
+    __slots__ = ()
+
+    fastpath = True
+
     def decode(self, value: str) -> Any:
         return value
 
@@ -236,12 +603,16 @@ class Noop(Codec):
 class Ready(Boolean):
     """Convert ready status: True, False."""
 
-    pass
+    __slots__ = ()
 
 
 class String(Codec):
     """String codec (noop)."""
 
+    __slots__ = ()
+
+    fastpath = True
+
     def decode(self, value: str) -> str:
         return value
 
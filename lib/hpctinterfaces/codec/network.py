@@ -5,11 +5,21 @@
 
 
 """Interface network codec objects.
+
+Decoded addresses and networks are interned: identical strings decode
+to the same (immutable) object, from a bounded (LRU) table shared by
+all codecs, so that the many units sharing addresses/subnets do not
+each pay for parsing.
+
+Addresses may be encoded as packed integers ("#" followed by 8 (IPv4)
+or 32 (IPv6) hex digits), which are faster to decode. Both encodings
+are always accepted by decode.
 """
 
 
 from . import Codec
 
+import functools
 import ipaddress
 import logging
 from typing import Any, Union
@@ -17,16 +27,76 @@ from typing import Any, Union
 
 logger = logging.getLogger(__name__)
 
+# entries of each intern table (enough for the addresses of a
+# 10k-unit relation)
+INTERN_SIZE = 16384
+
+PACKED_PREFIX = "#"
+
+
+@functools.lru_cache(maxsize=INTERN_SIZE)
+def _decode_address(value: str) -> Union[ipaddress.IPv4Address, ipaddress.IPv6Address]:
+    if value[:1] == PACKED_PREFIX:
+        if len(value) == 9:
+            return ipaddress.IPv4Address(int(value[1:], 16))
+        elif len(value) == 33:
+            return ipaddress.IPv6Address(int(value[1:], 16))
+        raise ValueError(f"bad packed address ({value})")
+    return ipaddress.ip_address(value)
+
+
+@functools.lru_cache(maxsize=INTERN_SIZE)
+def _decode_network(value: str) -> Union[ipaddress.IPv4Network, ipaddress.IPv6Network]:
+    return ipaddress.ip_network(value)
+
+
+def clear_intern():
+    """Clear the intern tables."""
+
+    _decode_address.cache_clear()
+    _decode_network.cache_clear()
+
+
+def get_intern_stats():
+    """Return stats of the intern tables."""
+
+    stats = {}
+    for name, func in [("address", _decode_address), ("network", _decode_network)]:
+        info = func.cache_info()
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+        }
+    return stats
+
 
 class IPAddress(Codec):
-    """IP address: IPv4Address, IPv6Address."""
+    """IP address: IPv4Address, IPv6Address.
 
+    If packed, addresses are encoded as "#" and the address, as an
+    integer, in hex: 8 digits for IPv4, 32 for IPv6.
+    """
+
+    __slots__ = ()
+
+    bulk_decode = staticmethod(_decode_address)
+    fastpath = True
     types = [ipaddress.IPv4Address, ipaddress.IPv6Address]
 
+    def __init__(self, packed: bool = False):
+        super().__init__()
+        self.params["packed"] = packed
+
     def _decode(self, value: str) -> Any:
-        return ipaddress.ip_address(value)
+        return _decode_address(value)
 
     def _encode(self, value: Union[ipaddress.IPv4Address, ipaddress.IPv6Address]) -> str:
+        if self.params["packed"]:
+            if value.version == 4:
+                return f"{PACKED_PREFIX}{int(value):08x}"
+            return f"{PACKED_PREFIX}{int(value):032x}"
         return str(value)
 
     def decode(self, value: str) -> Union[ipaddress.IPv4Address, ipaddress.IPv6Address]:
@@ -39,10 +109,14 @@ class IPAddress(Codec):
 class IPNetwork(Codec):
     """IP network: IPv4Network, IPv6Network."""
 
+    __slots__ = ()
+
+    bulk_decode = staticmethod(_decode_network)
+    fastpath = True
     types = [ipaddress.IPv4Network, ipaddress.IPv6Network]
 
     def _decode(self, value: str) -> Any:
-        return ipaddress.ip_network(value)
+        return _decode_network(value)
 
     def _encode(self, value: Union[ipaddress.IPv4Network, ipaddress.IPv6Network]) -> str:
         return str(value)
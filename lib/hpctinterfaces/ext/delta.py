@@ -0,0 +1,192 @@
+# Copyright 2022 Canonical Ltd.
+# See LICENSE file for licensing details.
+#
+# hpctinterfaces/ext/delta.py
+
+"""Block-level (rsync-style) delta support.
+
+The signature of a version of some data holds a weak (adler32) and a
+strong (blake2b) checksum for each block, packed and base85-encoded. The delta of new data
+against a signature is a block map, of block copies (from the old
+version) and literal data (from the new version), found with a
+rolling weak checksum, so that blocks are matched at any offset.
+
+To use:
+    signature = get_signature(old)
+    ops, literal = get_delta(signature, new)
+    new = apply_delta(old, signature["blocksize"], ops, literal)
+"""
+
+import base64
+import hashlib
+import math
+import struct
+import zlib
+
+# adler32 modulus
+MOD_ADLER = 65521
+
+MIN_BLOCKSIZE = 1024
+MAX_BLOCKSIZE = 64 * 1024
+
+# per block: weak (32 bit), strong (64 bit)
+SUMS_FORMAT = ">I8s"
+SUMS_SIZE = struct.calcsize(SUMS_FORMAT)
+
+
+def _strong(block):
+    return hashlib.blake2b(block, digest_size=8).digest()
+
+
+def get_blocksize(size):
+    """Return block size suitable for data of size (bytes): about the
+    square root of the size, as rsync."""
+
+    blocksize = int(math.sqrt(size)) // 64 * 64
+    return min(max(blocksize, MIN_BLOCKSIZE), MAX_BLOCKSIZE)
+
+
+def get_signature(data, blocksize=None):
+    """Return signature (dict) of data (bytes-like)."""
+
+    if blocksize == None:
+        blocksize = get_blocksize(len(data))
+
+    view = memoryview(data)
+    sums = bytearray()
+    for offset in range(0, len(data), blocksize):
+        block = view[offset : offset + blocksize]
+        sums += struct.pack(SUMS_FORMAT, zlib.adler32(block), _strong(block))
+
+    return {
+        "blocksize": blocksize,
+        "size": len(data),
+        "sums": base64.b85encode(sums).decode("utf-8"),
+    }
+
+
+def _add_copy(ops, i):
+    """Add copy of block i to ops, extending the last copy if it ends
+    at block i."""
+
+    if ops and ops[-1][0] == "c" and ops[-1][1] + ops[-1][2] == i:
+        ops[-1][2] += 1
+    else:
+        ops.append(["c", i, 1])
+
+
+def _add_literal(ops, literal, view, start, end):
+    """Flush view[start:end] (if any) to literal, and add it to ops,
+    extending the last literal."""
+
+    if end > start:
+        literal.extend(view[start:end])
+        if ops and ops[-1][0] == "l":
+            ops[-1][1] += end - start
+        else:
+            ops.append(["l", end - start])
+
+
+def _load_sums(signature):
+    """Return (strong, table) from signature: the strong checksums of
+    all blocks, and the full blocks by weak checksum (a short last
+    block is checked at the end only)."""
+
+    sums = base64.b85decode(signature["sums"].encode("utf-8"))
+    nblocks = signature["size"] // signature["blocksize"]
+    strong = []
+    table = {}
+    for i, (weak, block_strong) in enumerate(struct.iter_unpack(SUMS_FORMAT, sums)):
+        strong.append(block_strong)
+        if i < nblocks:
+            table.setdefault(weak, []).append(i)
+    return strong, table
+
+
+def _match_blocks(data, blocksize, strong, table, ops, literal):
+    """Match full blocks of data at any offset, with the rolling weak
+    checksum, adding copies and literals to ops. Returns the start of
+    the literal data not yet added."""
+
+    size = len(data)
+    view = memoryview(data)
+    table_get = table.get
+    pos = 0
+    literal_start = 0
+    weak = None
+    while pos + blocksize <= size:
+        if weak == None:
+            weak = zlib.adler32(view[pos : pos + blocksize])
+            a, b = weak & 0xFFFF, weak >> 16
+
+        candidates = table_get(weak)
+        if candidates:
+            block_strong = _strong(view[pos : pos + blocksize])
+            match = next((i for i in candidates if strong[i] == block_strong), None)
+            if match != None:
+                _add_literal(ops, literal, view, literal_start, pos)
+                _add_copy(ops, match)
+                pos += blocksize
+                literal_start = pos
+                weak = None
+                continue
+
+        if pos + blocksize == size:
+            break
+
+        # roll by one byte
+        out, new = data[pos], data[pos + blocksize]
+        a = (a - out + new) % MOD_ADLER
+        b = (b - blocksize * out + a - 1) % MOD_ADLER
+        weak = (b << 16) | a
+        pos += 1
+
+    return literal_start
+
+
+def get_delta(signature, data):
+    """Return delta of data (bytes-like) against signature.
+
+    Returns:
+        (ops, literal) where ops is a list of ["c", <block>, <count>]
+        (copy count blocks from block) and ["l", <length>] (take
+        length bytes of literal), and literal is bytes.
+    """
+
+    blocksize = signature["blocksize"]
+    strong, table = _load_sums(signature)
+    size = len(data)
+    view = memoryview(data)
+    ops = []
+    literal = bytearray()
+
+    literal_start = _match_blocks(data, blocksize, strong, table, ops, literal)
+
+    # short last block
+    lastsize = signature["size"] % blocksize
+    end = size
+    if lastsize and size - literal_start >= lastsize:
+        if _strong(view[size - lastsize : size]) == strong[-1]:
+            end = size - lastsize
+
+    _add_literal(ops, literal, view, literal_start, end)
+    if end != size:
+        _add_copy(ops, len(strong) - 1)
+
+    return ops, bytes(literal)
+
+
+def apply_delta(base, blocksize, ops, literal):
+    """Return data (bytes) rebuilt from base (bytes-like) and delta."""
+
+    view = memoryview(base)
+    data = bytearray()
+    offset = 0
+    for op in ops:
+        if op[0] == "c":
+            start = op[1] * blocksize
+            data.extend(view[start : start + op[2] * blocksize])
+        else:
+            data.extend(literal[offset : offset + op[1]])
+            offset += op[1]
+    return bytes(data)
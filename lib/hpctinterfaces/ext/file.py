@@ -16,27 +16,389 @@ To use:
     To save (to the same path as loaded from):
         iface = MyInterface()
         iface.save(iface.path)
+
+Large files can be sent in chunks (each under its own key), over one
+or more hooks, with the receiver acknowledging the chunks it has:
+    sender:
+        have = parse_ranges(ack.chunks) if ack.nonce == iface.nonce else set()
+        pending = iface.load_chunks("/etc/slurm/slurm.conf", have=have, limit=8)
+
+    receiver:
+        have, complete = iface.receive_chunks("/etc/slurm/slurm.conf", 0o644, "slurm", "slurm")
+        ack.nonce = iface.nonce
+        ack.chunks = format_ranges(have)
+
+Small changes to large files can be sent as a (block-level) delta
+against the previously loaded version, which the receiver applies to
+its copy (see ext/delta.py). A receiver without that version (e.g., a
+new unit, or one which missed a version) cannot apply the delta
+(save() raises an exception), so receivers acknowledge the checksum
+of their copy, and the sender stores the whole file while any receiver
+is behind. The signature of the loaded version, which the next delta
+is made against, is kept by the sender (in a local file, see
+load_delta()), not in the relation data:
+    sender:
+        iface.load_delta("/etc/slurm/topology.conf", bases=[ack.checksum for ack in acks])
+
+    receiver:
+        try:
+            iface.save("/etc/slurm/topology.conf")
+        except Exception:
+            # e.g., delta base mismatch: the sender stores the whole file
+            pass
+        ack.checksum = get_file_checksum("/etc/slurm/topology.conf") or ""
+
+Many files can be saved with one directory sync per directory:
+    save_files([(iface.hosts, "/etc/hosts"), (iface.key, "/etc/munge/munge.key", 0o400)])
+
+A set of files can be loaded and saved in parallel (by a thread pool):
+    class MyInterface(UnitInterface):
+        configfiles = FileSetInterface()
+
+    sender:
+        errors = iface.configfiles.load(["/etc/slurm/slurm.conf", "/etc/slurm/gres.conf"])
+
+    receiver:
+        written, errors = iface.configfiles.save()
 """
 
+import base64
 import grp
 import hashlib
+import json
 import os
 import pathlib
 import pwd
 import secrets
+import shutil
+import stat
+from concurrent.futures import ThreadPoolExecutor
+
+from hpctinterfaces.base import Interface, NoValue
+from hpctinterfaces.ext.delta import apply_delta, get_delta, get_signature
+from hpctinterfaces.value import Blob, Dict, Integer, String
+
+# read size for load(); must be a multiple of 4 (base85 encodes 4 byte
+# groups) so that the encoded blocks can be concatenated
+BLOCKSIZE = 256 * 1024
+
+# chunk size for load_chunks()
+CHUNKSIZE = 512 * 1024
+
+# worker threads for FileSetInterface
+MAX_WORKERS = 8
+
+
+def format_ranges(indices):
+    """Format (iterable of) integers as compact ranges (e.g., "0-3,7")."""
+
+    ranges = []
+    for i in sorted(set(indices)):
+        if ranges and ranges[-1][1] == i - 1:
+            ranges[-1][1] = i
+        else:
+            ranges.append([i, i])
+    return ",".join(f"{lo}-{hi}" if lo != hi else f"{lo}" for lo, hi in ranges)
+
+
+def parse_ranges(s):
+    """Parse ranges (see format_ranges()) to a set of integers."""
+
+    indices = set()
+    for r in s.split(","):
+        if r:
+            lo, _, hi = r.partition("-")
+            indices.update(range(int(lo), int(hi or lo) + 1))
+    return indices
+
+
+def get_file_values(p):
+    """Return dict of metadata values for file (pathlib.Path)."""
+
+    stat = p.stat()
+    return {
+        "gid": stat.st_gid,
+        "group": p.group(),
+        "mode": stat.st_mode,
+        "name": p.name,
+        "owner": p.owner(),
+        "path": str(p.resolve()),
+        "uid": stat.st_uid,
+    }
+
+
+def read_file(path, blocksize=BLOCKSIZE):
+    """Read file contents and metadata in a single pass.
+
+    The file is read in blocks, each of which updates the sha224
+    checksum and is base85-encoded (as for Blob) as it is read.
+
+    Returns:
+        (values, data) where values is a dict of metadata values and
+        data is the encoded contents.
+    """
+
+    if blocksize % 4:
+        raise Exception("blocksize must be a multiple of 4")
+
+    p = pathlib.Path(path)
+    if not p.exists():
+        raise Exception("path does not exist")
+
+    digest = hashlib.sha224()
+    encoded = bytearray()
+    size = 0
+    with open(p, "rb") as f:
+        for block in iter(lambda: f.read(blocksize), b""):
+            digest.update(block)
+            encoded += base64.b85encode(block)
+            size += len(block)
+    data = encoded.decode("utf-8")
+    del encoded
+
+    values = get_file_values(p)
+    values["nonce"] = secrets.token_urlsafe()
+    values["checksum"] = digest.hexdigest()
+    values["size"] = size
+
+    return values, data
+
+
+def get_file_checksum(path, blocksize=BLOCKSIZE):
+    """Return sha224 checksum (hex) of file contents, or None if the
+    file does not exist."""
+
+    digest = hashlib.sha224()
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(blocksize), b""):
+                digest.update(block)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def get_ids(user=None, group=None):
+    """Return (uid, gid) for user (name or uid) and group (name or
+    gid). Unset user/group is -1 (unchanged)."""
+
+    try:
+        user = user if user != None else -1
+        group = group if group != None else -1
+        uid = user if type(user) == int else pwd.getpwnam(user).pw_uid
+        gid = group if type(group) == int else grp.getgrnam(group).gr_gid
+    except:
+        raise Exception("cannot find owner/group")
+    return uid, gid
+
+
+def get_umask():
+    """Return the umask of the process."""
+
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except OSError:
+        pass
+
+    # not thread-safe
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+def _get_write_attrs(p, mode=None, uid=-1, gid=-1):
+    """Return (mode, uid, gid) to write file (pathlib.Path) with: those
+    given, else those of the existing file, if any."""
+
+    try:
+        st = p.stat()
+        mode = mode if mode != None else stat.S_IMODE(st.st_mode)
+        uid = uid if uid != -1 else st.st_uid
+        gid = gid if gid != -1 else st.st_gid
+    except FileNotFoundError:
+        pass
+    return mode, uid, gid
+
+
+def _set_fd_attrs(fd, mode=None, uid=-1, gid=-1):
+    """Set mode and ownership of open file, if different."""
 
-from hpctinterfaces.base import Interface
-from hpctinterfaces.value import Blob, Integer, String
+    st = os.fstat(fd)
+    if (uid not in [-1, st.st_uid]) or (gid not in [-1, st.st_gid]):
+        os.fchown(fd, uid, gid)
+    if mode != None and mode != stat.S_IMODE(st.st_mode):
+        os.fchmod(fd, mode)
+
+
+def set_file_attrs(path, mode=None, uid=-1, gid=-1):
+    """Set mode and ownership of file, if different."""
+
+    st = os.stat(path)
+    if (uid not in [-1, st.st_uid]) or (gid not in [-1, st.st_gid]):
+        os.chown(path, uid, gid)
+    if mode != None and mode != stat.S_IMODE(st.st_mode):
+        os.chmod(path, mode)
+
+
+def sync_dir(path):
+    """Flush directory (e.g., renames in it) to disk."""
+
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def open_part_file(partpath, path):
+    """Open (binary, read/write) partial file, only accessible to the
+    owner. A new partial file starts as a copy of path, if it exists."""
+
+    try:
+        fd = os.open(partpath, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o600)
+        created = True
+    except FileExistsError:
+        fd = os.open(partpath, os.O_RDWR)
+        created = False
+
+    f = os.fdopen(fd, "r+b")
+    try:
+        _set_fd_attrs(fd, 0o600)
+        if created and os.path.exists(path):
+            with open(path, "rb") as src:
+                shutil.copyfileobj(src, f)
+    except:
+        f.close()
+        raise
+    return f
+
+
+def rebuild_contents(path, checksum, delta, literal):
+    """Return file contents (bytes) rebuilt from the local copy at
+    path, which must match the version the delta was made against (or
+    the new version), and the delta (and its literal data)."""
+
+    p = pathlib.Path(path)
+    base = p.read_bytes() if p.exists() else b""
+    base_checksum = hashlib.sha224(base).hexdigest()
+    if base_checksum == checksum:
+        return base
+    if base_checksum != delta["base"]:
+        raise Exception("delta base mismatch")
+
+    contents = apply_delta(base, delta["blocksize"], delta["ops"], literal)
+    if hashlib.sha224(contents).hexdigest() != checksum:
+        raise Exception("checksum mismatch")
+    return contents
+
+
+def get_signature_path(path):
+    """Return default (local) signature path for file path (see
+    FileDataInterface.load_delta()): ".<name>.sig" in its directory."""
+
+    p = pathlib.Path(path)
+    return p.with_name(f".{p.name}.sig")
+
+
+def read_signature(sigpath, checksum):
+    """Return signature (see ext/delta.py) stored at sigpath for the
+    version with checksum, or None if there is none (e.g., missing or
+    for another version)."""
+
+    try:
+        with open(sigpath, "rb") as f:
+            signature = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if type(signature) != dict or signature.get("checksum") != checksum:
+        return None
+    return signature
+
+
+def write_signature(sigpath, checksum, signature):
+    """Store signature for the version with checksum at sigpath, only
+    accessible to the owner."""
+
+    contents = json.dumps(dict(signature, checksum=checksum)).encode("utf-8")
+    write_file(sigpath, contents, 0o600, syncdir=False)
+
+
+def write_file(path, contents, mode=None, uid=-1, gid=-1, syncdir=True):
+    """Write contents to file atomically.
+
+    The contents are written to a temporary file in the same directory,
+    which is given its mode and ownership (by default, those of the
+    existing file, if any) before any contents are written, flushed to
+    disk, and renamed to path. Readers see the old or the new file,
+    never a partial one.
+
+    Args:
+        path: File path.
+        contents: Contents (bytes).
+        mode: File mode.
+        uid: Owner uid (-1 for default).
+        gid: Group gid (-1 for default).
+        syncdir: Flush directory (i.e., the rename) to disk.
+    """
+
+    p = pathlib.Path(path)
+    mode, uid, gid = _get_write_attrs(p, mode, uid, gid)
+
+    # default permissions (per umask) unless set below
+    tmppath = p.with_name(f".{p.name}.{secrets.token_hex(4)}.tmp")
+    fd = os.open(tmppath, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600 if mode != None else 0o666)
+    try:
+        try:
+            _set_fd_attrs(fd, mode, uid, gid)
+
+            view = memoryview(contents)
+            while view:
+                view = view[os.write(fd, view) :]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmppath, p)
+    except:
+        tmppath.unlink(missing_ok=True)
+        raise
+
+    if syncdir:
+        sync_dir(p.parent)
+
+
+class FileAckInterface(Interface):
+    """Receiver acknowledgement of a file: the checksum of the copy
+    held (for deltas, see FileDataInterface.load_delta()), and, for a
+    chunked file, its nonce and the chunks (as ranges, see
+    format_ranges()) held."""
+
+    __slots__ = ()
+
+    checksum = String("")
+    chunks = String("")
+    nonce = String("")
 
 
 class FileDataInterface(Interface):
-    """Holds the contents and metadata for a file."""
+    """Holds the contents and metadata for a file.
+
+    The contents are held in data, or, if loaded in chunks, in
+    "chunk-<i>" keys described by the manifest. If loaded as a delta,
+    data holds the literal data for the delta.
+    """
+
+    __slots__ = ()
 
     comment = String("")
     checksum = String()
     data = Blob()
+    delta = Dict()
     gid = Integer()
     group = String()
+    manifest = Dict()
     mode = Integer()
     name = String()
     nonce = String()
@@ -45,54 +407,517 @@ class FileDataInterface(Interface):
     size = Integer()
     uid = Integer()
 
-    def load(self, path, checksum=False):
-        """Load file contents and metadata. Optionally, add sha224 checksum."""
+    def get_contents(self, path=None):
+        """Return file contents (bytes).
+
+        If a delta is held, the contents are rebuilt from the local
+        copy at path, which must match the version the delta was made
+        against (or the new version)."""
+
+        delta = self.delta
+        if delta == NoValue:
+            return self.data
+        return rebuild_contents(path, self.checksum, delta, self.data)
+
+    def _get_save_state(self):
+        """Return (checksum, raw data, delta), as needed by
+        _save_state(), or None if nothing is ready to save.
+
+        All store access for a save is done here (e.g., in the main
+        thread)."""
+
+        if self.nonce == "":
+            return None
+        return self.checksum, self._rawget(self._wirekeys["data"], NoValue), self.delta
+
+    def _clear_chunks(self):
+        """Clear manifest and chunks (see load_chunks())."""
+
+        manifest = self.manifest
+        if manifest != NoValue:
+            for i in range(len(manifest["checksums"])):
+                self.clear(f"chunk-{i}")
+            self.clear("manifest")
+
+    def _set_loaded(self, values, data):
+        """Store values and (encoded) data from read_file()."""
+
+        with self.batch():
+            for k, v in values.items():
+                setattr(self, k, v)
+            self._rawset(self._wirekeys["data"], data)
+            self._clear_chunks()
+            self.clear("delta")
+
+    def load(self, path, checksum=True, blocksize=BLOCKSIZE):
+        """Load file contents and metadata, with sha224 checksum.
+
+        The contents are read, checksummed and encoded in a single
+        pass (see read_file()), and stored without being held
+        decoded.
+
+        checksum is ignored (and kept for compatibility): the checksum
+        is always set, so that it matches the contents held."""
+
+        self._set_loaded(*read_file(path, blocksize))
+
+    def _update_chunk(self, i, chunk, unchanged, held, store, pending):
+        """Store or clear chunk i, as needed (see load_chunks()).
+
+        An unchanged chunk held by the receiver(s) is cleared, and one
+        already stored is kept. Otherwise, the chunk is stored if store
+        is set, else it is cleared and added to pending.
+
+        Returns:
+            True if the chunk was stored.
+        """
+
+        key = f"chunk-{i}"
+        stored = self._get(key, NoValue) not in [NoValue, ""]
+        if unchanged and held:
+            if stored:
+                self.clear(key)
+        elif unchanged and stored:
+            pass
+        elif store:
+            self._set(key, base64.b85encode(chunk).decode("utf-8"))
+            return True
+        else:
+            pending.add(i)
+            if stored:
+                self.clear(key)
+        return False
+
+    def load_chunks(self, path, chunksize=CHUNKSIZE, have=(), limit=None):
+        """Load file contents, in chunks, and metadata.
+
+        The contents are split into chunks, each stored (encoded as
+        for Blob) under a "chunk-<i>" key, and described by the
+        manifest (chunk size and sha224 checksum of each chunk). The
+        checksum (sha224) is always set.
+
+        Unchanged chunks (since the last load) already held by the
+        receiver(s) (have) are not stored (and are cleared), otherwise
+        they are not re-encoded. At most limit chunks are stored at once
+        (e.g., per hook); load_chunks() is called again to store more.
+
+        The nonce only changes with the contents.
+
+        Args:
+            path: File path.
+            chunksize: Chunk size, in bytes.
+            have: Indices of chunks held by the receiver(s).
+            limit: Maximum number of chunks to store.
+        Returns:
+            Set of indices of chunks not (yet) stored or held.
+        """
 
         p = pathlib.Path(path)
         if not p.exists():
             raise Exception("path does not exist")
 
-        self.data = data = p.read_bytes()
-        if checksum:
-            self.checksum = hashlib.sha224(data).hexdigest()
-        self.size = len(data)
-
-        self.path = str(p.resolve())
-        self.name = p.name
-        self.owner = p.owner()
-        self.group = p.group()
-        stat = p.stat()
-        self.mode = stat.st_mode
-        self.uid = stat.st_uid
-        self.gid = stat.st_gid
-        self.nonce = secrets.token_urlsafe()
+        manifest = self.manifest
+        if manifest == NoValue or manifest.get("chunksize") != chunksize:
+            prev_checksums = []
+        else:
+            prev_checksums = manifest["checksums"]
+        prev_checksum = self.checksum
+
+        digest = hashlib.sha224()
+        checksums = []
+        pending = set()
+        size = 0
+
+        with self.batch():
+            with open(p, "rb") as f:
+                for i, chunk in enumerate(iter(lambda: f.read(chunksize), b"")):
+                    digest.update(chunk)
+                    chunk_checksum = hashlib.sha224(chunk).hexdigest()
+                    checksums.append(chunk_checksum)
+                    size += len(chunk)
+
+                    unchanged = i < len(prev_checksums) and prev_checksums[i] == chunk_checksum
+                    store = limit == None or limit > 0
+                    if self._update_chunk(i, chunk, unchanged, i in have, store, pending):
+                        if limit != None:
+                            limit -= 1
+
+            # clear stale chunks
+            for i in range(len(checksums), len(prev_checksums)):
+                self.clear(f"chunk-{i}")
+
+            values = get_file_values(p)
+            values["checksum"] = digest.hexdigest()
+            values["size"] = size
+            if values["checksum"] != prev_checksum:
+                values["nonce"] = secrets.token_urlsafe()
+
+            for k, v in values.items():
+                setattr(self, k, v)
+            self.manifest = {
+                "checksums": checksums,
+                "chunksize": chunksize,
+            }
+            self.clear("data")
+            self.clear("delta")
+
+        return pending
+
+    def load_delta(self, path, blocksize=None, bases=None, sigpath=None):
+        """Load file contents, as a delta, and metadata.
+
+        The contents are compared, by block, against the signature of
+        the previously loaded version, and only the changed data and a
+        block map are stored. The signature of the contents is kept
+        for the next load_delta() in a local file (sigpath, by default
+        beside path, see get_signature_path()), with the checksum of
+        the contents, so that only the delta and checksum are sent. If
+        there is no previous version (or signature for it), or most of
+        the contents changed, the whole contents are stored (as for
+        load()).
+
+        A delta only applies to the version it was made against. If
+        bases (the checksums acknowledged by the receivers, see
+        FileAckInterface) has any other than that version or the new
+        one (e.g., "" for a receiver without the file), the whole
+        contents are stored instead, also if the contents did not
+        change.
+
+        The checksum (sha224) is always set. The nonce only changes
+        with the contents.
+
+        Args:
+            path: File path.
+            blocksize: Signature block size, in bytes (default is based
+                on the file size).
+            bases: Checksums of the copies held by the receivers.
+            sigpath: Local signature path.
+        """
+
+        p = pathlib.Path(path)
+        if not p.exists():
+            raise Exception("path does not exist")
+
+        data = p.read_bytes()
+        values = get_file_values(p)
+        values["checksum"] = hashlib.sha224(data).hexdigest()
+        values["size"] = len(data)
+
+        prev_checksum = self.checksum
+        sigpath = sigpath if sigpath != None else get_signature_path(p)
+        signature = read_signature(sigpath, prev_checksum)
+        bases = set(bases) - {values["checksum"]} if bases != None else set()
+        with self.batch():
+            if values["checksum"] != prev_checksum or signature == None:
+                values["nonce"] = secrets.token_urlsafe()
+                if signature != None and bases <= {prev_checksum}:
+                    ops, literal = get_delta(signature, data)
+                else:
+                    ops, literal = None, data
+
+                if len(literal) < len(data) // 2:
+                    self.delta = {
+                        "base": prev_checksum,
+                        "blocksize": signature["blocksize"],
+                        "ops": ops,
+                    }
+                    self.data = literal
+                else:
+                    # no previous version or mostly changed
+                    self.clear("delta")
+                    self.data = data
+                write_signature(sigpath, values["checksum"], get_signature(data, blocksize))
+            else:
+                delta = self.delta
+                if delta != NoValue and not bases <= {delta["base"]}:
+                    # receivers behind the delta base
+                    self.clear("delta")
+                    self.data = data
+
+            for k, v in values.items():
+                setattr(self, k, v)
+            self._clear_chunks()
+
+    def _receive_part(self, f, checksums, chunksize):
+        """Verify the chunks in the partial file (f), and write those
+        received (and verified) which are missing or bad. Returns the
+        set of indices of chunks held."""
+
+        have = set()
+        for i, chunk_checksum in enumerate(checksums):
+            f.seek(i * chunksize)
+            chunk = f.read(chunksize)
+            if hashlib.sha224(chunk).hexdigest() == chunk_checksum:
+                have.add(i)
+                continue
+
+            raw = self._get(f"chunk-{i}", NoValue)
+            if raw in [NoValue, ""]:
+                continue
+            chunk = base64.b85decode(raw.encode("utf-8"))
+            if hashlib.sha224(chunk).hexdigest() != chunk_checksum:
+                continue
+            f.seek(i * chunksize)
+            f.write(chunk)
+            have.add(i)
+        return have
+
+    def receive_chunks(self, path, mode=None, user=None, group=None):
+        """Receive chunks into a partial file ("<path>.part") and,
+        when all chunks have been received and verified, move it to
+        path. Optionally set mode and ownership (see save()).
+
+        Chunks already in the partial file (e.g., from an earlier
+        hook) are verified and kept. A new partial file starts as a
+        copy of path, if it exists, so that unchanged chunks of a new
+        version are not needed.
+
+        The partial file is only accessible to the owner until it is
+        complete, when it is given its mode and ownership (by default,
+        those of the existing file, if any), and flushed to disk,
+        before it is moved to path (as for write_file()).
+
+        If path already holds the contents (by sha224 checksum), the
+        partial file and path are not written (only mode and ownership
+        are set, if different), and all chunks are held.
+
+        Returns:
+            (have, complete) where have is the set of indices of chunks
+            held, and complete is True if the file was completed (or
+            was already complete).
+        """
+
+        manifest = self.manifest
+        if manifest == NoValue or self.nonce == "":
+            # nothing ready to receive
+            return set(), False
+
+        checksums = manifest["checksums"]
+        chunksize = manifest["chunksize"]
+        p = pathlib.Path(path)
+        partpath = pathlib.Path(f"{path}.part")
+        uid, gid = get_ids(user, group)
+
+        if get_file_checksum(p) == self.checksum:
+            set_file_attrs(p, mode, uid, gid)
+            return set(range(len(checksums))), True
+
+        with open_part_file(partpath, p) as f:
+            fd = f.fileno()
+            f.truncate(self.size)
+            have = self._receive_part(f, checksums, chunksize)
+            if len(have) != len(checksums):
+                return have, False
+
+            f.flush()
+            f.seek(0)
+            digest = hashlib.sha224()
+            for block in iter(lambda: f.read(BLOCKSIZE), b""):
+                digest.update(block)
+
+            if digest.hexdigest() != self.checksum:
+                raise Exception("checksum mismatch")
+
+            mode, uid, gid = _get_write_attrs(p, mode, uid, gid)
+            if mode == None:
+                mode = 0o666 & ~get_umask()
+            _set_fd_attrs(fd, mode, uid, gid)
+            os.fsync(fd)
+
+        os.replace(partpath, p)
+        sync_dir(p.parent)
+        return have, True
 
     def save(self, path, mode=None, user=None, group=None):
         """Save contents to file. Optionally set mode and ownership.
 
         user (name or uid) and group (name or gid) take integers
-        (uid/gid) or strings (owner/group)."""
+        (uid/gid) or strings (owner/group). If a delta is held, it is
+        applied to the file at path (see get_contents()).
 
-        if self.nonce == "":
-            # nothing ready to save
-            return
+        If the file already holds the contents (by sha224 checksum),
+        it is not written (only mode and ownership are set, if
+        different). Otherwise, it is written atomically (see
+        write_file()).
 
-        try:
-            user = user if user != None else -1
-            group = group if group != None else -1
-            uid = user if type(user) == int else pwd.getpwnam(user).pw_uid
-            gid = group if type(group) == int else grp.getgrnam(group).gr_gid
-        except:
-            raise Exception("cannot find owner/group")
-
-        # create/update securely
-        p = pathlib.Path(path)
-        p.touch()
+        Returns:
+            True if the file was written.
+        """
+
+        return self._save(path, mode, user, group)
+
+    def _save(self, path, mode=None, user=None, group=None, syncdir=True):
+        state = self._get_save_state()
+        if state == None:
+            return False
+        uid, gid = get_ids(user, group)
+        return _save_state(path, state, mode, uid, gid, syncdir)
+
+
+def _save_state(path, state, mode=None, uid=-1, gid=-1, syncdir=True):
+    """Save file from state (see FileDataInterface._get_save_state()),
+    without store access. Returns True if the file was written."""
+
+    checksum, raw, delta = state
+
+    file_checksum = get_file_checksum(path)
+    if checksum not in [NoValue, ""] and file_checksum == checksum:
+        set_file_attrs(path, mode, uid, gid)
+        return False
+
+    data = FileDataInterface.data.decode(raw)
+    if delta == NoValue:
+        contents = data
+    else:
+        contents = rebuild_contents(path, checksum, delta, data)
+
+    if checksum in [NoValue, ""] and file_checksum != None:
+        if file_checksum == hashlib.sha224(contents).hexdigest():
+            set_file_attrs(path, mode, uid, gid)
+            return False
+
+    write_file(path, contents, mode, uid, gid, syncdir)
+    return True
+
+
+def save_files(files):
+    """Save many files (see FileDataInterface.save()), with one
+    directory sync per directory (rather than per file).
+
+    Args:
+        files: Iterable of (iface, path[, mode[, user[, group]]]).
+    Returns:
+        List of paths written.
+    """
+
+    written = []
+    dirpaths = set()
+    try:
+        for iface, path, *args in files:
+            if iface._save(path, *args, syncdir=False):
+                written.append(path)
+                dirpaths.add(os.path.dirname(os.path.abspath(path)))
+    finally:
+        for dirpath in sorted(dirpaths):
+            sync_dir(dirpath)
+
+    return written
+
+
+def get_file_key(path):
+    """Return (deterministic) FileSetInterface key for path."""
+
+    return f"file-{hashlib.sha224(str(path).encode('utf-8')).hexdigest()[:16]}"
+
+
+class FileSetInterface(Interface):
+    """Holds a set of files, each in a FileDataInterface mounted at a
+    key derived from its path (see get_file_key()), with index mapping
+    paths to keys.
+
+    Files are read, checksummed and encoded (load()), or decoded and
+    written (save()), in parallel by a bounded thread pool; all store
+    access is done in the calling thread, in path order.
+    """
+
+    __slots__ = ()
+
+    index = Dict()
+
+    def get_file(self, path):
+        """Return FileDataInterface for path."""
+
+        key = get_file_key(path)
+        if key not in self._mounts:
+            self.mount(key, FileDataInterface())
+        return self._mounts[key]
+
+    def get_paths(self):
+        """Return (sorted) list of paths."""
+
+        index = self.index
+        return sorted(index) if index != NoValue else []
+
+    def load(self, paths, max_workers=MAX_WORKERS):
+        """Load files (see FileDataInterface.load()). Files which are
+        not in paths are removed from the set.
+
+        A file which fails to load keeps its previous values, if any.
+
+        Returns:
+            Dict of path to exception for files which failed to load.
+        """
+
+        paths = sorted(set(map(str, paths)))
+        prev_paths = self.get_paths()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {path: executor.submit(read_file, path) for path in paths}
+
+        errors = {}
+        with self.batch():
+            for path in paths:
+                try:
+                    values, data = futures[path].result()
+                except Exception as e:
+                    errors[path] = e
+                    continue
+                self.get_file(path)._set_loaded(values, data)
+
+            for path in prev_paths:
+                if path not in paths:
+                    fileiface = self.get_file(path)
+                    for k in fileiface.get_keys():
+                        fileiface.clear(k)
+
+            self.index = {
+                path: get_file_key(path)
+                for path in paths
+                if path not in errors or path in prev_paths
+            }
+
+        return errors
+
+    def save(self, paths=None, mode=None, user=None, group=None, max_workers=MAX_WORKERS):
+        """Save files (see FileDataInterface.save()), all or those in
+        paths, to their paths, with one directory sync per directory.
+
+        Returns:
+            (written, errors) where written is a (sorted) list of paths
+            written and errors is a dict of path to exception for
+            files which failed to save.
+        """
+
+        index = self.index
+        index = index if index != NoValue else {}
+        paths = sorted(set(map(str, paths))) if paths != None else sorted(index)
+        uid, gid = get_ids(user, group)
+
+        errors = {}
+        states = {}
+        for path in paths:
+            if path not in index:
+                errors[path] = Exception("path not in file set")
+                continue
+            state = self.get_file(path)._get_save_state()
+            if state != None:
+                states[path] = state
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                path: executor.submit(_save_state, path, state, mode, uid, gid, False)
+                for path, state in states.items()
+            }
 
-        if (uid, gid) != (-1, -1):
-            os.chown(path, uid, gid)
+        written = []
+        for path in sorted(futures):
+            try:
+                if futures[path].result():
+                    written.append(path)
+            except Exception as e:
+                errors[path] = e
 
-        if mode != None:
-            p.chmod(mode)
+        for dirpath in sorted(set(os.path.dirname(os.path.abspath(path)) for path in written)):
+            sync_dir(dirpath)
 
-        p.write_bytes(self.data)
+        return written, dict(sorted(errors.items()))
@@ -27,6 +27,8 @@ from hpctinterfaces.value import Blob, String
 class MessageInterface(Interface):
     """Holds a message ([b]inary or [t]ext) and helpful metadata."""
 
+    __slots__ = ()
+
     bdata = Blob()
     comment = String("")
     dtype = String(checker=_checker.OneOf(["b", "t"]))
@@ -0,0 +1,316 @@
+# Copyright 2022 Canonical Ltd.
+# See LICENSE file for licensing details.
+#
+# hpctinterfaces/index.py
+
+
+"""Index of the network fields of unit buckets.
+
+NetworkIndex indexes the addresses (ingress_address, private_address)
+and egress subnets (egress_subnets, comma-separated) of the (other
+side) units of all relations of a RelationSuperInterface, to answer
+without walking all the units:
+* which units own an address (lookup())
+* which units sit in a subnet (units_in())
+* which egress subnet is the most specific for an address
+  (longest_prefix_match())
+
+Units are identified by (relation id, unit name).
+
+Addresses and subnets are kept, per IP version, as sorted integer
+intervals (searched with bisect), and subnets also by prefix length
+(for longest-prefix match). Raw values are decoded with the (interning)
+network codecs.
+
+The index is built on first use, from the relations (via the
+RelationCache), and updated incrementally for the bucket of a single
+unit with update() and remove(). Usage:
+```
+    index = NetworkIndex(slurmd)
+    relation_id, unitname = index.lookup("10.0.3.17")[0]
+
+    # in relation-changed/-departed handlers
+    index.update(event.relation.id, event.unit)
+    index.remove(event.relation.id, event.departing_unit)
+```
+"""
+
+
+import bisect
+import ipaddress
+import logging
+from typing import Union
+
+from .base import NoValue
+from .codec import network as _network_codec
+from .relation import OTHER_ROLE, UnitBucketInterface
+from .store import get_relation_cache
+
+
+logger = logging.getLogger(__name__)
+
+ADDRESS_FIELDS = ["ingress_address", "private_address"]
+SUBNET_FIELDS = ["egress_subnets"]
+
+_ADDRESS_CODEC = _network_codec.IPAddress()
+_NETWORK_CODEC = _network_codec.IPNetwork()
+
+
+def _to_address(address):
+    if isinstance(address, str):
+        return _ADDRESS_CODEC.decode(address)
+    return address
+
+
+def _to_network(network):
+    if isinstance(network, str):
+        return _NETWORK_CODEC.decode(network)
+    return network
+
+
+def _sortkey(obj):
+    return (obj.version, obj)
+
+
+def _remove(items, item):
+    i = bisect.bisect_left(items, item)
+    if i < len(items) and items[i] == item:
+        del items[i]
+
+
+class NetworkIndex:
+    """Index of the network fields of the unit buckets of the other
+    side, for all relations of a RelationSuperInterface.
+    """
+
+    def __init__(self, superiface):
+        """Setup.
+
+        Args:
+            superiface: RelationSuperInterface.
+        """
+
+        self.superiface = superiface
+        self.built = False
+
+        # (relation id, unit name) -> (addresses, subnets) entries
+        self.entries = {}
+
+        # version -> sorted [(address, key)]
+        self.addresses = {4: [], 6: []}
+
+        # version -> sorted [(first, last, prefixlen, key)]
+        self.subnets = {4: [], 6: []}
+
+        # (version, prefixlen) -> {network address: (subnet, set of keys)}
+        self.prefixes = {}
+
+    def __len__(self):
+        self._build()
+        return len(self.entries)
+
+    def _add(self, key, addresses, subnets, insort=True):
+        """Add entry. Without insort, the interval lists are left
+        unsorted (see _build())."""
+
+        add = bisect.insort if insort else list.append
+        for address in addresses:
+            add(self.addresses[address.version], (int(address), key))
+        for subnet in subnets:
+            first = int(subnet.network_address)
+            add(
+                self.subnets[subnet.version],
+                (first, int(subnet.broadcast_address), subnet.prefixlen, key),
+            )
+            prefix = self.prefixes.setdefault((subnet.version, subnet.prefixlen), {})
+            prefix.setdefault(first, (subnet, set()))[1].add(key)
+        self.entries[key] = (addresses, subnets)
+
+    def _build(self):
+        """Build index (once) from all relations."""
+
+        if self.built:
+            return
+        self.built = True
+
+        wirekeys = self._get_wirekeys()
+        for relation in get_relation_cache(self.superiface.charm).get_relations(
+            self.superiface.relname
+        ):
+            for unit in relation.units:
+                key = (relation.id, unit.name)
+                self._add(key, *self._decode(key, relation.data[unit], wirekeys), insort=False)
+
+        for items in list(self.addresses.values()) + list(self.subnets.values()):
+            items.sort()
+
+    def _decode(self, key, data, wirekeys):
+        """Return (addresses, subnets) decoded from the (raw) bucket
+        data. Bad values are logged and skipped."""
+
+        addresses = set()
+        subnets = set()
+        for field, wirekey in wirekeys.items():
+            raw = data.get(wirekey, NoValue)
+            if raw in [NoValue, ""]:
+                continue
+            try:
+                if field in SUBNET_FIELDS:
+                    subnets.update(_NETWORK_CODEC.decode(s.strip()) for s in raw.split(","))
+                else:
+                    addresses.add(_ADDRESS_CODEC.decode(raw))
+            except Exception as e:
+                logger.warning(f"skipping bad {field} ({raw}) for unit ({key}) error ({e})")
+        return sorted(addresses, key=_sortkey), sorted(subnets, key=_sortkey)
+
+    def _discard(self, key):
+        entry = self.entries.pop(key, None)
+        if entry == None:
+            return
+
+        addresses, subnets = entry
+        for address in addresses:
+            _remove(self.addresses[address.version], (int(address), key))
+        for subnet in subnets:
+            first = int(subnet.network_address)
+            _remove(
+                self.subnets[subnet.version],
+                (first, int(subnet.broadcast_address), subnet.prefixlen, key),
+            )
+            prefix = self.prefixes[(subnet.version, subnet.prefixlen)]
+            keys = prefix[first][1]
+            keys.discard(key)
+            if not keys:
+                del prefix[first]
+                if not prefix:
+                    del self.prefixes[(subnet.version, subnet.prefixlen)]
+
+    def _get_wirekeys(self):
+        """Return wire keys of the network fields (by field name), of
+        the unit interface class of the other side."""
+
+        superiface = self.superiface
+        interface_cls = superiface.get_interface_class(OTHER_ROLE[superiface.get_role()], "unit")
+        if interface_cls == None:
+            interface_cls = UnitBucketInterface
+
+        wirekeys = {}
+        for field in ADDRESS_FIELDS + SUBNET_FIELDS:
+            wirekeys[field] = interface_cls._schema_wirekeys.get(
+                field, UnitBucketInterface._schema_wirekeys[field]
+            )
+        return wirekeys
+
+    def _update(self, relation_id, unitname, data, wirekeys):
+        key = (relation_id, unitname)
+        addresses, subnets = self._decode(key, data, wirekeys)
+        entry = self.entries.get(key)
+        if entry != None and entry == (addresses, subnets):
+            return
+        self._discard(key)
+        self._add(key, addresses, subnets)
+
+    def clear(self):
+        """Clear index. It is rebuilt on next use."""
+
+        self.built = False
+        self.entries.clear()
+        self.addresses = {4: [], 6: []}
+        self.subnets = {4: [], 6: []}
+        self.prefixes.clear()
+
+    def get(self, relation_id: int, unitname: str):
+        """Return (addresses, subnets) indexed for the unit, or None."""
+
+        self._build()
+        return self.entries.get((relation_id, unitname))
+
+    def longest_prefix_match(
+        self, address: Union[str, ipaddress.IPv4Address, ipaddress.IPv6Address]
+    ):
+        """Return the most specific egress subnet containing address.
+
+        Returns:
+            (subnet, keys) where keys is a sorted list of (relation id,
+            unit name) with that subnet, or None if there is no match.
+        """
+
+        self._build()
+        address = _to_address(address)
+        version = address.version
+        value = int(address)
+        maxlen = address.max_prefixlen
+
+        prefixlens = sorted(
+            (prefixlen for v, prefixlen in self.prefixes if v == version), reverse=True
+        )
+        for prefixlen in prefixlens:
+            first = value >> (maxlen - prefixlen) << (maxlen - prefixlen)
+            match = self.prefixes[(version, prefixlen)].get(first)
+            if match != None:
+                subnet, keys = match
+                return subnet, sorted(keys)
+        return None
+
+    def lookup(self, address: Union[str, ipaddress.IPv4Address, ipaddress.IPv6Address]):
+        """Return sorted list of (relation id, unit name) of the units
+        with address (as ingress or private address)."""
+
+        self._build()
+        address = _to_address(address)
+        value = int(address)
+        items = self.addresses[address.version]
+        i = bisect.bisect_left(items, (value,))
+        keys = []
+        while i < len(items) and items[i][0] == value:
+            keys.append(items[i][1])
+            i += 1
+        return keys
+
+    def remove(self, relation_id: int, unit):
+        """Remove unit (or unit name) from the index."""
+
+        self._build()
+        self._discard((relation_id, getattr(unit, "name", unit)))
+
+    def units_in(self, subnet: Union[str, ipaddress.IPv4Network, ipaddress.IPv6Network]):
+        """Return sorted list of (relation id, unit name) of the units
+        with an address or an egress subnet within subnet."""
+
+        self._build()
+        subnet = _to_network(subnet)
+        first = int(subnet.network_address)
+        last = int(subnet.broadcast_address)
+
+        keys = set()
+        items = self.addresses[subnet.version]
+        i = bisect.bisect_left(items, (first,))
+        while i < len(items) and items[i][0] <= last:
+            keys.add(items[i][1])
+            i += 1
+
+        items = self.subnets[subnet.version]
+        i = bisect.bisect_left(items, (first,))
+        while i < len(items) and items[i][0] <= last:
+            if items[i][1] <= last:
+                keys.add(items[i][3])
+            i += 1
+
+        return sorted(keys)
+
+    def update(self, relation_id: int, unit):
+        """Update index from the bucket of unit (e.g., on
+        relation-changed)."""
+
+        if not self.built:
+            # built with the current data of all units
+            self._build()
+            return
+
+        relation = get_relation_cache(self.superiface.charm).get_relation(
+            self.superiface.relname, relation_id
+        )
+        if relation == None or unit not in relation.units:
+            self._discard((relation_id, unit.name))
+            return
+        self._update(relation_id, unit.name, relation.data[unit], self._get_wirekeys())
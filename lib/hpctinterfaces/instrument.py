@@ -0,0 +1,293 @@
+# Copyright 2022 Canonical Ltd.
+# See LICENSE file for licensing details.
+#
+# hpctinterfaces/instrument.py
+
+"""Opt-in instrumentation: counts and times, per interface class and
+per key, of:
+* Value get/set ("get", "set")
+* codec encode/decode ("encode", "decode") and checker checks ("check")
+  made by Values
+* store reads/writes by interfaces ("store-read", "store-write"), by
+  wire key
+
+and, per relation name, of relation bucket reads/writes
+("bucket-read", "bucket-write", as BucketStore) and relation lookups
+("lookup", as RelationCache).
+
+Instrumentation works by replacing the methods (and the compiled
+encode/decode functions of Values) involved when enabled, and
+restoring them when disabled, so there is no overhead otherwise.
+Times are inclusive (e.g., "get" includes "store-read" and "decode").
+
+Values of interface classes defined after enable() are counted for
+get/set but not encode/decode/check.
+
+To use:
+    from hpctinterfaces import instrument
+
+    with instrument.collect() as stats:
+        ...
+    logger.debug(f"stats ({stats})")
+
+or:
+    instrument.enable()
+    ...
+    logger.debug(f"stats ({iface.get_stats()['instrument']})")
+    instrument.disable()
+"""
+
+import time
+from contextlib import contextmanager
+
+from .base import Interface, Value, compile_codec
+from .checker import MEMO_SIZE, make_raw_check
+from .store import BucketStore, RelationCache
+
+# (cls, key, category) -> [count, time (ns)]
+_counters = {}
+
+# (cls, key) of the Value being got/set, for encode/decode/check
+_context = [None]
+
+# enable() depth
+_enabled = 0
+
+# (obj, name, original) of replaced attributes
+_saved = []
+
+_perf = time.perf_counter_ns
+
+
+def _record(cls, key, category, ns):
+    counter = _counters.get((cls, key, category))
+    if counter == None:
+        _counters[(cls, key, category)] = [1, ns]
+    else:
+        counter[0] += 1
+        counter[1] += ns
+
+
+def _replace(obj, name, value):
+    """Replace attribute (saving the original, see disable())."""
+
+    _saved.append((obj, name, obj.__dict__[name]))
+    setattr(obj, name, value)
+
+
+def _get_subclasses(cls):
+    """Return all subclasses of cls."""
+
+    subclasses = []
+    for subcls in cls.__subclasses__():
+        subclasses.append(subcls)
+        subclasses.extend(_get_subclasses(subcls))
+    return subclasses
+
+
+def _wrap_get(get):
+    def __get__(self, owner, objtype=None):
+        if owner is None:
+            return get(self, owner, objtype)
+
+        context = _context[0]
+        _context[0] = cls_key = (owner.__class__, self.name)
+        t0 = _perf()
+        try:
+            return get(self, owner, objtype)
+        finally:
+            _record(*cls_key, "get", _perf() - t0)
+            _context[0] = context
+
+    return __get__
+
+
+def _wrap_set(set_):
+    def __set__(self, owner, value):
+        context = _context[0]
+        _context[0] = cls_key = (owner.__class__, self.name)
+        t0 = _perf()
+        try:
+            set_(self, owner, value)
+        finally:
+            _record(*cls_key, "set", _perf() - t0)
+            _context[0] = context
+
+    return __set__
+
+
+def _wrap_raw(method, category):
+    def wrapper(self, wirekey, *args, **kwargs):
+        t0 = _perf()
+        try:
+            return method(self, wirekey, *args, **kwargs)
+        finally:
+            _record(self.__class__, wirekey, category, _perf() - t0)
+
+    return wrapper
+
+
+def _wrap_relname(method, category):
+    """Wrap method of object with relname (as BucketStore) or with
+    relname as first argument (as RelationCache)."""
+
+    def wrapper(self, *args, **kwargs):
+        t0 = _perf()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            relname = getattr(self, "relname", None) or (args[0] if args else None)
+            _record(self.__class__, relname, category, _perf() - t0)
+
+    return wrapper
+
+
+def _make_value_functions(value, cls):
+    """Return (encode, decode) for value, split into (separately
+    recorded) codec and checker work. The (cls, key) recorded is that
+    of the current get/set, or the class defining the value."""
+
+    encode, decode = compile_codec(value.codec, None, value.strict)
+    default_cls_key = (cls, value.name)
+    check = None
+    if value.checker:
+        checker_check = value.checker.check
+
+        def timed_check(v):
+            cls_key = _context[0] or default_cls_key
+            t0 = _perf()
+            try:
+                return checker_check(v)
+            finally:
+                _record(*cls_key, "check", _perf() - t0)
+
+        # only checks made (not those skipped by the memo) are recorded
+        memo_size = 0 if value.strict else MEMO_SIZE
+        check = make_raw_check(value.checker, check=timed_check, memo_size=memo_size)
+
+    def _encode(v):
+        cls_key = _context[0] or default_cls_key
+        t0 = _perf()
+        raw = encode(v)
+        _record(*cls_key, "encode", _perf() - t0)
+        if check:
+            check(v, raw)
+        return raw
+
+    def _decode(raw):
+        cls_key = _context[0] or default_cls_key
+        t0 = _perf()
+        v = decode(raw)
+        _record(*cls_key, "decode", _perf() - t0)
+        if check:
+            check(v, raw)
+        return v
+
+    return _encode, _decode
+
+
+@contextmanager
+def collect(reset_stats=True):
+    """Enable instrumentation for the block, and fill the dict
+    yielded with the stats (see get_stats()) on exit."""
+
+    stats = {}
+    enable()
+    if reset_stats:
+        reset()
+    try:
+        yield stats
+    finally:
+        stats.update(get_stats())
+        disable()
+
+
+def disable():
+    """Disable instrumentation (for the outermost enable())."""
+
+    global _enabled
+
+    if _enabled == 0:
+        return
+    _enabled -= 1
+    if _enabled:
+        return
+
+    while _saved:
+        obj, name, original = _saved.pop()
+        setattr(obj, name, original)
+
+
+def enable():
+    """Enable instrumentation. Calls nest (see disable())."""
+
+    global _enabled
+
+    _enabled += 1
+    if _enabled > 1:
+        return
+
+    _replace(Value, "__get__", _wrap_get(Value.__get__))
+    _replace(Value, "__set__", _wrap_set(Value.__set__))
+    _replace(Interface, "_rawclear", _wrap_raw(Interface._rawclear, "store-write"))
+    _replace(Interface, "_rawget", _wrap_raw(Interface._rawget, "store-read"))
+    _replace(Interface, "_rawset", _wrap_raw(Interface._rawset, "store-write"))
+    _replace(BucketStore, "__getitem__", _wrap_relname(BucketStore.__getitem__, "bucket-read"))
+    _replace(BucketStore, "get_many", _wrap_relname(BucketStore.get_many, "bucket-read"))
+    _replace(BucketStore, "update", _wrap_relname(BucketStore.update, "bucket-write"))
+    _replace(RelationCache, "get_relation", _wrap_relname(RelationCache.get_relation, "lookup"))
+    _replace(RelationCache, "get_relations", _wrap_relname(RelationCache.get_relations, "lookup"))
+
+    seen = set()
+    for cls in _get_subclasses(Interface):
+        for name, value in cls.__dict__.items():
+            if isinstance(value, Value) and value.codec != None and id(value) not in seen:
+                seen.add(id(value))
+                _encode, _decode = _make_value_functions(value, cls)
+                _replace(value, "_encode", _encode)
+                _replace(value, "_decode", _decode)
+
+
+def get_interface_stats(iface):
+    """Return stats (see get_stats()) for the classes of the interface
+    and its subinterfaces."""
+
+    classes = set()
+    ifaces = [iface]
+    while ifaces:
+        iface = ifaces.pop()
+        classes.add(iface.__class__)
+        for obj in iface._get_members().values():
+            if isinstance(obj, Interface) and obj.__class__ not in classes:
+                ifaces.append(obj)
+    return get_stats(classes)
+
+
+def get_stats(classes=None):
+    """Return stats, optionally only for (collection of) classes:
+    {<class name>: {<key>: {<category>: {"count": <n>, "time": <s>}}}}.
+    """
+
+    stats = {}
+    for (cls, key, category), (count, ns) in sorted(
+        _counters.items(), key=lambda item: (item[0][0].__name__, str(item[0][1]), item[0][2])
+    ):
+        if classes != None and cls not in classes:
+            continue
+        stats.setdefault(cls.__name__, {}).setdefault(key, {})[category] = {
+            "count": count,
+            "time": ns / 1e9,
+        }
+    return stats
+
+
+def is_enabled():
+    """Return if instrumentation is enabled."""
+
+    return _enabled > 0
+
+
+def reset():
+    """Reset all counters."""
+
+    _counters.clear()
@@ -8,6 +8,7 @@
 """
 
 
+import importlib
 import logging
 from typing import Union
 
@@ -16,20 +17,66 @@ from .base import Interface, SuperInterface
 
 logger = logging.getLogger(__name__)
 
+# entry point group for interfaces provided by other packages
+ENTRY_POINT_GROUP = "hpctinterfaces.interfaces"
+
 
 class InterfaceRegistry:
     """Registry of interfaces by name.
 
     Supports Interface and SuperInterface.
+
+    Classes may be registered by dotted import path (e.g.,
+    "hpctinterfaces.relation:AppConfigRelationSuperInterface"), and
+    are also found from the "hpctinterfaces.interfaces" entry point
+    group. In both cases, the class is imported on first use.
     """
 
     def __init__(self):
         self.classes = {}
+        self.entry_points_loaded = False
+
+    def _load_entry_points(self):
+        """Register (by import path) interfaces from entry points, once.
+
+        Explicit registrations take precedence."""
+
+        if self.entry_points_loaded:
+            return
+        self.entry_points_loaded = True
+
+        from importlib.metadata import entry_points
+
+        for ep in entry_points(group=ENTRY_POINT_GROUP):
+            self.classes.setdefault(ep.name, ep.value)
+
+    def _resolve(self, name: str):
+        """Return interface class by name, importing it if registered by
+        path."""
+
+        cls = self.classes.get(name)
+        if type(cls) == str:
+            modname, _, qualname = cls.partition(":")
+            if not qualname:
+                modname, _, qualname = cls.rpartition(".")
+
+            obj = importlib.import_module(modname)
+            for attr in qualname.split("."):
+                obj = getattr(obj, attr)
+            cls = self.classes[name] = self._check(obj)
+        return cls
+
+    def _check(self, cls):
+        if not issubclass(cls, (Interface, SuperInterface)):
+            raise Exception(f"cls ({cls}) not an Interface")
+        return cls
 
     def get(self, name: str):
         """Get the interface class by name."""
 
-        return self.classes.get(name)
+        if name not in self.classes:
+            self._load_entry_points()
+        return self._resolve(name)
 
     def load(self, name: str, *args, **kwargs):
         """Get the interfaces class and set it up with the args."""
@@ -41,24 +88,30 @@ class InterfaceRegistry:
             return None
 
     def items(self):
-        """Get interface (key, value) items of registered entries."""
+        """Get interface (key, value) items of registered entries.
 
-        return self.classes.items()
+        Note: Imports all lazily registered classes."""
+
+        return [(name, self.get(name)) for name in self.keys()]
 
     def keys(self):
         """Get interface keys of registered entries."""
 
+        self._load_entry_points()
         return self.classes.keys()
 
-    def register(self, name: str, cls: Union[Interface, SuperInterface]):
-        """Register interface class by name."""
+    def register(self, name: str, cls: Union[Interface, SuperInterface, str]):
+        """Register interface class, or its import path
+        ("<module>:<qualname>" or "<module>.<name>"), by name."""
 
-        if not issubclass(cls, (Interface, SuperInterface)):
-            raise Exception(f"cls ({cls}) not an Interface")
+        if type(cls) != str:
+            self._check(cls)
 
         self.classes[name] = cls
 
     def values(self):
-        """Get interface classes of registered entries."""
+        """Get interface classes of registered entries.
+
+        Note: Imports all lazily registered classes."""
 
-        return self.classes.values()
+        return [self.get(name) for name in self.keys()]
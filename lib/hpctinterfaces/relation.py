@@ -8,13 +8,14 @@
 """
 
 
+import json
 import logging
 from typing import Any, Union
 
-from . import interface_registry
-from .base import BaseInterface, Interface, NoValue, SuperInterface
+from .base import BaseInterface, Interface, NoValue, SuperInterface, Value
+from .codec import Boolean, Float, Integer
 from .value import Blob, Ready
-from .value.network import IPAddress, IPNetwork
+from .value.network import IPAddress, IPNetwork, Port
 
 
 logger = logging.getLogger(__name__)
@@ -30,7 +31,7 @@ OTHER_ROLE = {
 # base classes
 #
 
-from .store import BucketStore
+from .store import BucketStore, get_relation_cache
 
 
 class MockRelation:
@@ -44,6 +45,8 @@ class MockRelation:
 class BucketInterface(BaseInterface):
     """Interface for relation bucket storage."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         charm,
@@ -165,18 +168,22 @@ class AppBucketInterface(BucketInterface):
     Note All app relation bucket interfaces should subclass this!
     """
 
-    pass
+    __slots__ = ()
 
 
 class AppConfigBucketInterface(AppBucketInterface):
     """ """
 
+    __slots__ = ()
+
     config = Blob()
 
 
 class AppSecureConfigBucketInterface(AppBucketInterface):
     """ """
 
+    __slots__ = ()
+
     config = Blob()
 
 
@@ -189,6 +196,8 @@ class UnitBucketInterface(BucketInterface):
     Note: All unit relation bucket interfaces should subclass this!
     """
 
+    __slots__ = ()
+
     egress_subnets = IPNetwork(access="r")
     ingress_address = IPAddress(access="r")
     private_address = IPAddress(access="r")
@@ -202,12 +211,16 @@ class UnitBucketInterface(BucketInterface):
 class AppReadyBucketInterface(AppBucketInterface):
     """Provides status that the application is "ready"."""
 
+    __slots__ = ()
+
     status = Ready(False)
 
 
 class UnitReadyBucketInterface(UnitBucketInterface):
     """Provides status that the unit is "ready"."""
 
+    __slots__ = ()
+
     status = Ready(False)
 
 
@@ -238,6 +251,68 @@ class RelationSuperInterface(SuperInterface):
             ("peer", "unit"): None,
         }
 
+    def gather(self, field: str, buckettype="unit", asarray=True):
+        """Gather the (decoded) value of field from the buckets of the
+        other side, for all relations.
+
+        All relations and units are walked once, and the values are
+        decoded together (see Value.decode_many()) without making an
+        interface for each bucket.
+
+        If NumPy is available (and asarray), values are returned as an
+        array where there is a suitable dtype: IPv4 addresses (packed)
+        as uint32, ports as uint16, integers as int64, floats as
+        float64, booleans as bool. Otherwise, values are a list.
+
+        Args:
+            field: Value name.
+            buckettype: "app" or "unit".
+            asarray: Return NumPy array if possible.
+        Returns:
+            (names, values) where names are the unit (or app) names.
+        Raises:
+            BatchError if any value fails to decode.
+        """
+
+        role = self.get_role()
+        interface_cls = self.get_interface_class(OTHER_ROLE[role], buckettype)
+        value = interface_cls._schema.get(field) if interface_cls else None
+        if not isinstance(value, Value):
+            raise Exception(f"field ({field}) not a value of ({interface_cls})")
+        wirekey = value.wirekey
+
+        # see Interface._packed
+        packedkey = None
+        if interface_cls._packed != None and "w" in value.access:
+            packedkey = interface_cls._packed.replace("_", "-")
+        docs = {}
+
+        names = []
+        raws = []
+        for relation in get_relation_cache(self.charm).get_relations(self.relname):
+            if buckettype == "app":
+                buckets = [relation.app] if relation.app else []
+            else:
+                buckets = sorted(relation.units, key=lambda unit: unit.name)
+
+            for bucket in buckets:
+                names.append(bucket.name)
+                if packedkey == None:
+                    raws.append(relation.data[bucket].get(wirekey, NoValue))
+                    continue
+
+                # identical packed documents are decoded once
+                raw = relation.data[bucket].get(packedkey, "")
+                doc = docs.get(raw)
+                if doc == None:
+                    doc = docs[raw] = json.loads(raw) if raw else {}
+                raws.append(doc.get(wirekey, NoValue))
+
+        values = value.decode_many(raws)
+        if asarray:
+            values = _to_array(value, values)
+        return names, values
+
     def get_doc(self, show_values=False):
         """Return json doc about super interface."""
 
@@ -284,7 +359,7 @@ class RelationSuperInterface(SuperInterface):
     def is_ready(self):
         """Return if the relation is ready."""
 
-        return len(self.charm.model.get_relations(self.relname)) > 0
+        return len(get_relation_cache(self.charm).get_relations(self.relname)) > 0
 
     def select(self, bucketkey, relation_id=None):
         """Select and return interface to use.
@@ -328,6 +403,30 @@ class RelationSuperInterface(SuperInterface):
         return iface
 
 
+def _to_array(value, values):
+    """Return values as NumPy array, by value type, if possible."""
+
+    try:
+        import numpy
+    except ImportError:
+        return values
+
+    if isinstance(value, Port):
+        return numpy.array(values, dtype=numpy.uint16)
+
+    codec = value.codec
+    if isinstance(codec, Boolean):
+        return numpy.array(values, dtype=numpy.bool_)
+    elif isinstance(codec, Float):
+        return numpy.array(values, dtype=numpy.float64)
+    elif isinstance(codec, Integer):
+        return numpy.array(values, dtype=numpy.int64)
+    elif isinstance(value, IPAddress) and all(v.version == 4 for v in values):
+        return numpy.array([int(v) for v in values], dtype=numpy.uint32)
+
+    return values
+
+
 class AppConfigRelationSuperInterface(RelationSuperInterface):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -361,11 +460,3 @@ class SubordinateReadyRelationSuperInterface(RelationSuperInterface):
         super().__init__(*args, **kwargs)
 
         self.interface_classes[("requirer", "unit")] = UnitReadyBucketInterface
-
-
-# register interfaces
-
-interface_registry.register("relation-app-config", AppConfigRelationSuperInterface)
-interface_registry.register("relation-app-secure-config", AppSecureConfigRelationSuperInterface)
-interface_registry.register("relation-app-ready", AppReadyRelationSuperInterface)
-interface_registry.register("relation-subordinate-ready", SubordinateReadyRelationSuperInterface)
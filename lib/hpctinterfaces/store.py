@@ -3,17 +3,200 @@
 #
 # hpctinterfaces/store.py
 
+import weakref
+
 from .base import NoValue
 
 
+class RelationCache:
+    """Cache of relation objects and leadership status for a charm.
+
+    There is one cache per charm (see get_relation_cache()), shared by
+    all BucketStores for the charm.
+
+    Caching is opt-in; otherwise, lookups go to the charm model:
+    * enable() caches relations (for all relation names) and leadership
+      status for as long as the charm object lives. This suits a charm
+      object which lives for one hook (as with Juju, where each hook
+      runs in a new process), for which these do not change.
+    * observe() caches relations for a relation name, and drops them on
+      the relation events which change them. This suits long-lived
+      charm objects (e.g., with the ops Harness), as long as the
+      changes are made with events.
+
+    Cached entries are also dropped by invalidate().
+    """
+
+    def __init__(self, charm):
+        self.charm = weakref.ref(charm)
+        self.enabled = False
+        self.leader = None
+        self.observed = {}
+        self.relation = {}
+        self.relations = {}
+
+    def disable(self):
+        """Disable caching (see enable()) and drop cached entries."""
+
+        self.enabled = False
+        self.invalidate()
+
+    def enable(self):
+        """Enable caching of relations and leadership status, for as
+        long as the charm object lives.
+
+        Usage (in the charm __init__()):
+        ```
+            get_relation_cache(self).enable()
+        ```
+        """
+
+        self.enabled = True
+
+    def get_relation(self, relname, relation_id=None):
+        """Return (cached) relation, as charm.model.get_relation()."""
+
+        if not self.enabled and relname not in self.observed:
+            return self.charm().model.get_relation(relname, relation_id)
+
+        key = (relname, relation_id)
+        try:
+            return self.relation[key]
+        except KeyError:
+            relation = self.relation[key] = self.charm().model.get_relation(relname, relation_id)
+            return relation
+
+    def get_relations(self, relname):
+        """Return list of relations for relname (from cache, if
+        enabled). The list is the caller's to change."""
+
+        if not self.enabled and relname not in self.observed:
+            return list(self.charm().model.relations.get(relname, []))
+
+        try:
+            relations = self.relations[relname]
+        except KeyError:
+            relations = self.relations[relname] = list(
+                self.charm().model.relations.get(relname, [])
+            )
+        return list(relations)
+
+    def invalidate(self, relname=None):
+        """Drop cached relations for relname, or everything if not
+        given."""
+
+        if relname == None:
+            self.leader = None
+            self.relation.clear()
+            self.relations.clear()
+        else:
+            self.relations.pop(relname, None)
+            for key in [key for key in self.relation if key[0] == relname]:
+                del self.relation[key]
+
+    def invalidate_leader(self):
+        """Drop cached leadership status."""
+
+        self.leader = None
+
+    def is_leader(self):
+        """Return leadership status of the charm unit (cached, if
+        enabled)."""
+
+        if not self.enabled:
+            return self.charm().unit.is_leader()
+
+        if self.leader == None:
+            self.leader = self.charm().unit.is_leader()
+        return self.leader
+
+    def observe(self, relname):
+        """Cache relations for relname, and invalidate them on
+        relation-created, -joined, -departed and -broken events. Also
+        invalidate leadership status (see enable()) on leader-elected.
+
+        Usage (in the charm __init__()):
+        ```
+            get_relation_cache(self).observe("slurmd")
+        ```
+        """
+
+        if relname in self.observed:
+            return
+
+        from ops.framework import Object
+
+        class RelationCacheObserver(Object):
+            def __init__(self, cache, relname):
+                super().__init__(cache.charm(), f"relation-cache-{relname}")
+                self.cache = cache
+                self.relname = relname
+
+            def _on_leader_elected(self, event):
+                self.cache.invalidate_leader()
+
+            def _on_relation_event(self, event):
+                self.cache.invalidate(self.relname)
+
+        charm = self.charm()
+        observer = self.observed[relname] = RelationCacheObserver(self, relname)
+        events = charm.on[relname]
+        for event in [
+            events.relation_created,
+            events.relation_joined,
+            events.relation_departed,
+            events.relation_broken,
+        ]:
+            charm.framework.observe(event, observer._on_relation_event)
+        charm.framework.observe(charm.on.leader_elected, observer._on_leader_elected)
+
+
+_relation_caches = weakref.WeakKeyDictionary()
+
+
+def get_relation_cache(charm):
+    """Return the RelationCache for the charm."""
+
+    cache = _relation_caches.get(charm)
+    if cache == None:
+        cache = _relation_caches[charm] = RelationCache(charm)
+    return cache
+
+
 class BucketStore:
-    """Data store for relation data bucket."""
+    """Data store for relation data bucket.
+
+    Writes of a value already held in the bucket are dropped (and
+    counted as "suppressed" in stats), so that republishing unchanged
+    data does not trigger relation-changed events.
+
+    Relation objects and leadership status come from the RelationCache
+    of the charm (cached only if enabled there).
+
+    Keys are stored as wire keys (see Interface.get_wirekey()), with
+    "_" replaced by "-", so that attribute-style names (e.g.,
+    "ingress_address") and wire keys (as from interfaces) refer to the
+    same item.
+    """
+
+    __slots__ = (
+        "bucketkey",
+        "cache",
+        "charm",
+        "nsuppressed",
+        "nwrites",
+        "relation_id",
+        "relname",
+    )
 
     def __init__(self, charm, relname, bucketkey, relation_id=None):
+        self.cache = get_relation_cache(charm) if charm != None else None
         self.charm = charm
         self.relname = relname
         self.bucketkey = bucketkey
         self.relation_id = relation_id
+        self.nsuppressed = 0
+        self.nwrites = 0
 
     def __delitem__(self, key):
         """According to `RelationDataContent.__delitem__()."""
@@ -29,9 +212,31 @@ class BucketStore:
             return value
 
     def __setitem__(self, key, value):
-        key = key.replace("_", "-")
+        self.update({key: value})
+
+    @property
+    def stats(self):
+        """Write counters."""
+
+        return {
+            "writes": self.nwrites,
+            "suppressed": self.nsuppressed,
+        }
+
+    def update(self, d):
+        """Update multiple items with one update per relation. A value
+        of NoValue deletes the key.
+
+        Note: An unset key and "" are the same to the relation bucket."""
+
+        d = {k.replace("_", "-"): ("" if v is NoValue else v) for k, v in d.items()}
         for relation in self.get_relations():
-            relation.data[self.bucketkey].update({key: value})
+            data = relation.data[self.bucketkey]
+            changed = {k: v for k, v in d.items() if data.get(k, "") != v}
+            self.nsuppressed += len(d) - len(changed)
+            if changed:
+                data.update(changed)
+                self.nwrites += len(changed)
 
     def get(self, key, default=None):
         try:
@@ -39,22 +244,37 @@ class BucketStore:
         except:
             return default
 
+    def get_many(self, keys):
+        """Get multiple items, from one read of the bucket. Unset keys
+        have NoValue."""
+
+        relation = self.get_relation()
+        data = relation.data[self.bucketkey] if relation else {}
+        return {key: data.get(key.replace("_", "-"), NoValue) for key in keys}
+
+    def get_leader_relations(self):
+        """Return relations, only if leader."""
+
+        return self.get_relations() if self.cache.is_leader() else []
+
     def get_relation(self, relation_id=None):
         if relation_id == None:
             relation_id = self.relation_id
-        return self.charm.model.get_relation(self.relname, relation_id)
+        return self.cache.get_relation(self.relname, relation_id)
 
     def get_relations(self):
         if self.relation_id != None:
-            relations[self.get_relation()]
+            relations = [self.get_relation()]
         else:
-            relations = self.charm.model.relations.get(self.relname, [])
+            relations = self.cache.get_relations(self.relname)
         return relations
 
 
 class MockBucketStore(BucketStore):
     """Minimal mock for BucketStore."""
 
+    __slots__ = ("data",)
+
     def __init__(self, charm, relname, bucketkey, relation_id, *args, **kwargs):
         super().__init__(charm, relname, bucketkey, relation_id, *args, **kwargs)
 
@@ -63,6 +283,9 @@ class MockBucketStore(BucketStore):
             "unit": {},
         }
 
+    def get_leader_relations(self):
+        return [self]
+
     def get_relation(self, relation_id=None):
         return self
 
@@ -22,8 +22,12 @@ class Blob(Value):
     codec = _codec.Blob()
 
 
+class CompressedBlob(Value):
+    codec = _codec.CompressedBlob()
+
+
 class Dict(Value):
-    codec = _codec.Json()
+    codec = _codec.Json(canonical=True)
 
 
 class Float(Value):
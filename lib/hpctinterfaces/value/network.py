@@ -20,6 +20,10 @@ class IPAddress(Value):
     default = ipaddress.IPv4Address("0.0.0.0")
 
 
+class PackedIPAddress(IPAddress):
+    codec = _network_codec.IPAddress(packed=True)
+
+
 class IPNetwork(Value):
     codec = _network_codec.IPNetwork()
     default = ipaddress.IPv4Network("0.0.0.0")
@@ -0,0 +1,182 @@
+# Copyright 2022 Canonical Ltd.
+# See LICENSE file for licensing details.
+#
+# tests/benchmarks/conftest.py
+
+"""Benchmark (pytest-benchmark) fixtures, with a fake charm model of
+N relations x M (remote) units, each unit bucket populated as a
+compute node would (addresses, port, node config).
+
+Run (results are saved in .benchmarks/, by commit):
+    tox -e bench
+    tox -e bench -- --nrelations 8 --nunits 256
+
+Compare with saved runs (e.g., to catch regressions between commits):
+    tox -e bench -- --benchmark-compare --benchmark-compare-fail=mean:10%
+    pytest-benchmark --storage .benchmarks compare
+"""
+
+import os.path
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), "../../lib")))
+
+from hpctinterfaces.base import Interface
+from hpctinterfaces.relation import RelationSuperInterface, UnitBucketInterface
+from hpctinterfaces.store import get_relation_cache
+from hpctinterfaces.value import Boolean, Dict, Integer, String
+from hpctinterfaces.value.network import Port
+
+RELNAME = "slurmd"
+
+# units of the (single relation) model for large-scale benchmarks
+BIG_NUNITS = 10000
+
+
+def pytest_addoption(parser):
+    parser.addoption("--nrelations", type=int, default=4, help="number of relations")
+    parser.addoption("--nunits", type=int, default=64, help="number of units per relation")
+
+
+class FakeApp:
+    def __init__(self, name):
+        self.name = name
+
+
+class FakeUnit:
+    def __init__(self, name, app, leader=False):
+        self.app = app
+        self.leader = leader
+        self.name = name
+
+    def is_leader(self):
+        return self.leader
+
+
+class FakeRelation:
+    """Relation with data buckets for the local unit and app (also as
+    "unit" and "app"), and for the remote app and units."""
+
+    def __init__(self, relation_id, unit, app, remote_app, nunits):
+        self.app = remote_app
+        self.id = relation_id
+        self.units = set(
+            FakeUnit(f"{remote_app.name}/{i}", remote_app)
+            for i in range(relation_id * nunits, (relation_id + 1) * nunits)
+        )
+
+        self.data = {unit: {}, app: {}, remote_app: {}}
+        self.data["unit"] = self.data[unit]
+        self.data["app"] = self.data[app]
+        for i, remote_unit in enumerate(sorted(self.units, key=lambda u: u.name)):
+            self.data[remote_unit] = make_unit_data(relation_id, i)
+
+
+class FakeModel:
+    def __init__(self, relations):
+        self.relations = relations
+
+    def get_relation(self, relname, relation_id=None):
+        relations = self.relations.get(relname, [])
+        if relation_id == None:
+            return relations[0] if relations else None
+        for relation in relations:
+            if relation.id == relation_id:
+                return relation
+
+
+class FakeCharm:
+    def __init__(self, nrelations, nunits):
+        self.app = FakeApp("slurmctld")
+        self.unit = FakeUnit("slurmctld/0", self.app, leader=True)
+        relations = [
+            FakeRelation(i, self.unit, self.app, FakeApp("slurmd"), nunits)
+            for i in range(nrelations)
+        ]
+        self.model = FakeModel({RELNAME: relations})
+
+
+def make_unit_data(relation_id, i):
+    """Return (raw) unit bucket data for a compute node."""
+
+    return {
+        "egress-subnets": f"10.{relation_id}.{i // 256}.{i % 256}/32",
+        "ingress-address": f"10.{relation_id}.{i // 256}.{i % 256}",
+        "private-address": f"10.{relation_id}.{i // 256}.{i % 256}",
+        "config": '{"cpus":64,"features":["avx2"],"real_memory":256000,"state":"UNKNOWN"}',
+        "cpus": "64",
+        "hostname": f"node-{relation_id}-{i}",
+        "node.partition": "batch",
+        "node.weight": "1",
+        "port": "6818",
+        "ready": "1",
+    }
+
+
+class NodeInterface(Interface):
+    partition = String("")
+    weight = Integer(1)
+
+
+class NodeUnitBucketInterface(UnitBucketInterface):
+    config = Dict()
+    cpus = Integer(0)
+    hostname = String("")
+    node = NodeInterface()
+    port = Port()
+    ready = Boolean(False)
+
+
+@pytest.fixture
+def nrelations(request):
+    return request.config.getoption("--nrelations")
+
+
+@pytest.fixture
+def nunits(request):
+    return request.config.getoption("--nunits")
+
+
+@pytest.fixture
+def charm(nrelations, nunits):
+    # one hook per charm object, as with Juju
+    charm = FakeCharm(nrelations, nunits)
+    get_relation_cache(charm).enable()
+    return charm
+
+
+@pytest.fixture
+def superiface(charm):
+    siface = RelationSuperInterface(charm, RELNAME, role="provider")
+    siface.interface_classes[("requirer", "unit")] = NodeUnitBucketInterface
+    siface.interface_classes[("provider", "unit")] = NodeUnitBucketInterface
+    return siface
+
+
+@pytest.fixture(scope="session")
+def big_charm():
+    charm = FakeCharm(1, BIG_NUNITS)
+    get_relation_cache(charm).enable()
+    return charm
+
+
+@pytest.fixture(scope="session")
+def big_remote_units(big_charm):
+    return [
+        (relation.id, unit)
+        for relation in big_charm.model.relations[RELNAME]
+        for unit in sorted(relation.units, key=lambda u: u.name)
+    ]
+
+
+@pytest.fixture
+def remote_units(charm):
+    """Return list of (relation id, unit) for all remote units."""
+
+    return [
+        (relation.id, unit)
+        for relation in charm.model.relations[RELNAME]
+        for unit in sorted(relation.units, key=lambda u: u.name)
+    ]
@@ -0,0 +1,59 @@
+# Copyright 2022 Canonical Ltd.
+# See LICENSE file for licensing details.
+#
+# tests/benchmarks/test_codec.py
+
+import ipaddress
+
+import pytest
+
+from hpctinterfaces import codec
+from hpctinterfaces.codec import network
+
+CONFIG = {
+    "nodes": {
+        f"node{i:03d}": {"cpus": 64, "features": ["avx2", "ib"], "real_memory": 256000}
+        for i in range(32)
+    },
+    "partitions": {"batch": {"default": True, "max_time": "7-00:00:00"}},
+}
+
+TEXT = (
+    "NodeName=node[000-511] CPUs=64 Boards=1 SocketsPerBoard=2 CoresPerSocket=16"
+    " ThreadsPerCore=2 RealMemory=256000 State=UNKNOWN\n"
+) * 64
+
+# (id, codec, value)
+CODECS = [
+    ("blob", codec.Blob(), TEXT.encode("utf-8")),
+    ("boolean", codec.Boolean(), True),
+    ("compressedblob", codec.CompressedBlob(), TEXT.encode("utf-8")),
+    ("float", codec.Float(), 1234.5678),
+    ("integer", codec.Integer(), 256000),
+    ("json", codec.Json(), CONFIG),
+    ("json-canonical", codec.Json(canonical=True), CONFIG),
+    ("noop", codec.Noop(), "value"),
+    ("ready", codec.Ready(), True),
+    ("string", codec.String(), "node-0-0.cluster.local"),
+    ("ipaddress", network.IPAddress(), ipaddress.ip_address("10.1.2.3")),
+    ("ipaddress-v6", network.IPAddress(), ipaddress.ip_address("fd00::1:2:3")),
+    ("ipaddress-packed", network.IPAddress(packed=True), ipaddress.ip_address("10.1.2.3")),
+    ("ipnetwork", network.IPNetwork(), ipaddress.ip_network("10.1.0.0/16")),
+    ("ipnetwork-v6", network.IPNetwork(), ipaddress.ip_network("fd00::/64")),
+]
+
+
+@pytest.mark.parametrize("c,value", [(c, v) for _, c, v in CODECS], ids=[i for i, _, _ in CODECS])
+def test_encode(benchmark, c, value):
+    benchmark(c.encode, value)
+
+
+@pytest.mark.parametrize("c,value", [(c, v) for _, c, v in CODECS], ids=[i for i, _, _ in CODECS])
+def test_decode(benchmark, c, value):
+    benchmark(c.decode, c.encode(value))
+
+
+@pytest.mark.parametrize("c,value", [(c, v) for _, c, v in CODECS], ids=[i for i, _, _ in CODECS])
+def test_compiled_decode(benchmark, c, value):
+    _, decode = c.compile()
+    benchmark(decode, c.encode(value))
@@ -0,0 +1,50 @@
+# Copyright 2022 Canonical Ltd.
+# See LICENSE file for licensing details.
+#
+# tests/benchmarks/test_file.py
+
+import os
+
+import pytest
+
+from hpctinterfaces.base import BaseInterface
+from hpctinterfaces.ext.file import FileDataInterface
+
+SIZES = [4 * 1024, 256 * 1024, 4 * 1024 * 1024]
+
+
+class FileInterface(BaseInterface):
+    file = FileDataInterface()
+
+
+@pytest.fixture(params=SIZES, ids=[f"{size // 1024}k" for size in SIZES])
+def path(request, tmp_path):
+    path = tmp_path / "slurm.conf"
+    path.write_bytes(os.urandom(request.param))
+    return path
+
+
+def test_load(benchmark, path):
+    iface = FileInterface()
+    benchmark(iface.file.load, path, checksum=True)
+
+
+def test_save(benchmark, path, tmp_path):
+    def save():
+        # changed, so that it is written
+        if outpath.exists():
+            outpath.unlink()
+        return iface.file.save(outpath)
+
+    iface = FileInterface()
+    iface.file.load(path, checksum=True)
+    outpath = tmp_path / "out.conf"
+    benchmark(save)
+
+
+def test_save_unchanged(benchmark, path, tmp_path):
+    iface = FileInterface()
+    iface.file.load(path, checksum=True)
+    outpath = tmp_path / "out.conf"
+    iface.file.save(outpath)
+    benchmark(iface.file.save, outpath)
@@ -0,0 +1,80 @@
+# Copyright 2022 Canonical Ltd.
+# See LICENSE file for licensing details.
+#
+# tests/benchmarks/test_index.py
+
+"""NetworkIndex benchmarks for a 10k-unit relation, against a linear
+scan of the unit buckets (as without the index)."""
+
+import ipaddress
+
+import pytest
+from conftest import RELNAME, NodeUnitBucketInterface
+
+from hpctinterfaces.index import NetworkIndex
+from hpctinterfaces.relation import RelationSuperInterface
+
+ADDRESS = "10.0.38.123"
+SUBNET = "10.0.16.0/20"
+
+
+@pytest.fixture
+def big_superiface(big_charm):
+    siface = RelationSuperInterface(big_charm, RELNAME, role="provider")
+    siface.interface_classes[("requirer", "unit")] = NodeUnitBucketInterface
+    return siface
+
+
+@pytest.fixture
+def index(big_superiface):
+    index = NetworkIndex(big_superiface)
+    len(index)
+    return index
+
+
+def test_build(benchmark, big_superiface):
+    benchmark(lambda: len(NetworkIndex(big_superiface)))
+
+
+def test_scan_lookup(benchmark, big_charm):
+    # linear scan, as without the index
+    def scan():
+        address = ipaddress.ip_address(ADDRESS)
+        return [
+            (relation.id, unit.name)
+            for relation in big_charm.model.relations[RELNAME]
+            for unit in relation.units
+            if ipaddress.ip_address(relation.data[unit]["ingress-address"]) == address
+        ]
+
+    benchmark(scan)
+
+
+def test_lookup(benchmark, index):
+    benchmark(index.lookup, ADDRESS)
+
+
+def test_units_in(benchmark, index):
+    benchmark(index.units_in, SUBNET)
+
+
+def test_longest_prefix_match(benchmark, index):
+    benchmark(index.longest_prefix_match, ADDRESS)
+
+
+def test_update(benchmark, index, big_remote_units):
+    # alternate the ingress address of one unit
+    relation_id, unit = big_remote_units[len(big_remote_units) // 2]
+    data = index.superiface.charm.model.get_relation(RELNAME, relation_id).data[unit]
+    original = data["ingress-address"]
+    addresses = [original, "172.16.0.1"]
+
+    def update():
+        addresses.reverse()
+        data["ingress-address"] = addresses[0]
+        index.update(relation_id, unit)
+
+    try:
+        benchmark(update)
+    finally:
+        data["ingress-address"] = original
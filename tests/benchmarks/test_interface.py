@@ -0,0 +1,75 @@
+# Copyright 2022 Canonical Ltd.
+# See LICENSE file for licensing details.
+#
+# tests/benchmarks/test_interface.py
+
+from conftest import RELNAME, NodeInterface, NodeUnitBucketInterface
+
+from hpctinterfaces.base import BaseInterface
+from hpctinterfaces.value import Integer, String
+
+
+class LocalInterface(BaseInterface):
+    cpus = Integer(0)
+    hostname = String("")
+    node = NodeInterface()
+
+
+def make_iface(charm, remote_units):
+    relation_id, unit = remote_units[0]
+    return NodeUnitBucketInterface(charm, RELNAME, unit, relation_id)
+
+
+def test_value_get(benchmark, charm, remote_units):
+    iface = make_iface(charm, remote_units)
+    benchmark(getattr, iface, "cpus")
+
+
+def test_value_get_uncached(benchmark, charm, remote_units):
+    def get():
+        iface._cache.clear()
+        return iface.cpus
+
+    iface = make_iface(charm, remote_units)
+    benchmark(get)
+
+
+def test_value_get_nested(benchmark, charm, remote_units):
+    iface = make_iface(charm, remote_units)
+    benchmark(lambda: iface.node.partition)
+
+
+def test_value_set(benchmark):
+    iface = LocalInterface()
+    benchmark(setattr, iface.node, "weight", 10)
+
+
+def test_value_set_bucket(benchmark, charm):
+    # unchanged (suppressed) write to the local unit bucket
+    iface = NodeUnitBucketInterface(charm, RELNAME, "unit")
+    iface.cpus = 64
+    benchmark(setattr, iface, "cpus", 64)
+
+
+def test_get_all_keys(benchmark, charm, remote_units):
+    iface = make_iface(charm, remote_units)
+    benchmark(iface.get_all_keys)
+
+
+def test_mount(benchmark):
+    def mount():
+        iface = LocalInterface()
+        iface.mount("extra", NodeInterface())
+        return iface
+
+    benchmark(mount)
+
+
+def test_set_base(benchmark):
+    iface = LocalInterface()
+    benchmark(iface._set_base, iface)
+
+
+def test_snapshot(benchmark, charm, remote_units):
+    iface = make_iface(charm, remote_units)
+    benchmark(iface.snapshot)
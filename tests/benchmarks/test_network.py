@@ -0,0 +1,72 @@
+# Copyright 2022 Canonical Ltd.
+# See LICENSE file for licensing details.
+#
+# tests/benchmarks/test_network.py
+
+"""Network codec benchmarks for a 10k-unit relation: addresses unique
+to each unit, subnets shared by 256 units. Parsing (ipaddress) is the
+baseline for decoding with (warm or cold) intern tables."""
+
+import ipaddress
+
+import pytest
+from conftest import BIG_NUNITS, RELNAME, NodeUnitBucketInterface
+
+from hpctinterfaces.codec import network
+from hpctinterfaces.relation import RelationSuperInterface
+from hpctinterfaces.store import get_relation_cache
+
+ADDRESSES = [f"10.{i // 65536}.{i // 256 % 256}.{i % 256}" for i in range(BIG_NUNITS)]
+SUBNETS = [f"10.{i // 65536}.{i // 256 % 256}.0/24" for i in range(BIG_NUNITS)]
+
+ADDRESS_CODECS = [
+    ("plain", network.IPAddress()),
+    ("packed", network.IPAddress(packed=True)),
+]
+
+
+def test_parse_addresses(benchmark):
+    benchmark(lambda: [ipaddress.ip_address(raw) for raw in ADDRESSES])
+
+
+@pytest.mark.parametrize("c", [c for _, c in ADDRESS_CODECS], ids=[i for i, _ in ADDRESS_CODECS])
+def test_decode_addresses(benchmark, c):
+    _, decode = c.compile()
+    raws = [c.encode(ipaddress.ip_address(raw)) for raw in ADDRESSES]
+    benchmark(lambda: [decode(raw) for raw in raws])
+
+
+@pytest.mark.parametrize("c", [c for _, c in ADDRESS_CODECS], ids=[i for i, _ in ADDRESS_CODECS])
+def test_decode_addresses_cold(benchmark, c):
+    _, decode = c.compile()
+    raws = [c.encode(ipaddress.ip_address(raw)) for raw in ADDRESSES]
+    benchmark.pedantic(
+        lambda: [decode(raw) for raw in raws], setup=network.clear_intern, rounds=20
+    )
+
+
+def test_parse_subnets(benchmark):
+    benchmark(lambda: [ipaddress.ip_network(raw) for raw in SUBNETS])
+
+
+def test_decode_subnets(benchmark):
+    _, decode = network.IPNetwork().compile()
+    benchmark(lambda: [decode(raw) for raw in SUBNETS])
+
+
+def test_read_unit_addresses(benchmark, big_charm, big_remote_units):
+    # one interface per unit, as a charm would walk the units
+    def read():
+        get_relation_cache(big_charm).invalidate()
+        return [
+            NodeUnitBucketInterface(big_charm, RELNAME, unit, relation_id).ingress_address
+            for relation_id, unit in big_remote_units
+        ]
+
+    benchmark(read)
+
+
+def test_gather_addresses(benchmark, big_charm):
+    siface = RelationSuperInterface(big_charm, RELNAME, role="provider")
+    siface.interface_classes[("requirer", "unit")] = NodeUnitBucketInterface
+    benchmark(siface.gather, "ingress_address", asarray=False)
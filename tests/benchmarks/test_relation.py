@@ -0,0 +1,49 @@
+# Copyright 2022 Canonical Ltd.
+# See LICENSE file for licensing details.
+#
+# tests/benchmarks/test_relation.py
+
+import pytest
+from conftest import RELNAME, NodeUnitBucketInterface
+
+from hpctinterfaces.store import get_relation_cache
+
+
+def test_select_unit(benchmark, superiface):
+    benchmark(superiface.select, "unit")
+
+
+def test_select_remote_units(benchmark, superiface, remote_units):
+    pytest.importorskip("ops.model")
+
+    def select():
+        return [superiface.select(unit, relation_id) for relation_id, unit in remote_units]
+
+    benchmark(select)
+
+
+def test_read_remote_units(benchmark, charm, remote_units):
+    # one interface per unit, as a charm would walk the units
+    def read():
+        get_relation_cache(charm).invalidate()
+        return [
+            NodeUnitBucketInterface(charm, RELNAME, unit, relation_id).cpus
+            for relation_id, unit in remote_units
+        ]
+
+    benchmark(read)
+
+
+def test_snapshot_remote_units(benchmark, charm, remote_units):
+    def snapshot():
+        return [
+            NodeUnitBucketInterface(charm, RELNAME, unit, relation_id).snapshot()
+            for relation_id, unit in remote_units
+        ]
+
+    benchmark(snapshot)
+
+
+@pytest.mark.parametrize("field", ["cpus", "ingress_address", "config"])
+def test_gather(benchmark, superiface, field):
+    benchmark(superiface.gather, field)
@@ -27,8 +27,6 @@ requires:
 """
 
 
-import re
-
 from hpctinterfaces import checker, codec
 from hpctinterfaces import interface_registry
 from hpctinterfaces.relation import (
@@ -37,6 +35,7 @@ from hpctinterfaces.relation import (
     RelationSuperInterface,
     UnitBucketInterface,
 )
+from hpctinterfaces.value.network import Port
 
 
 INGRESS_URL_RE = (
@@ -47,12 +46,6 @@ INGRESS_URL_RE = (
 )
 
 
-class IngressUrlChecker(checker.Checker):
-    def check(self, value):
-        if not re.match(INGRESS_URL_RE, value):
-            raise checker.CheckError("url does not conform")
-
-
 class IngressRelationSuperInterface(RelationSuperInterface):
     """From https://github.com/canonical/charm-relation-interfaces/tree/main/ingress_per_unit.
 
@@ -110,7 +103,7 @@ class IngressProviderAppBucketInterface(AppBucketInterface):
     """
 
     # minimal conversion/validation
-    url = Value(codec.String(), None, IngressUrlChecker())
+    url = Value(None, checker.Regexp(INGRESS_URL_RE), codec.String())
 
 
 class IngressRequirerUnitBucketInterface(UnitBucketInterface):
@@ -127,10 +120,10 @@ class IngressRequirerUnitBucketInterface(UnitBucketInterface):
     each unit of the requirer application.
     """
 
-    name = Value(codec.String(), "")
-    host = Value(codec.String(), "")
-    port = Value(codec.Integer(), -1, checker.Port())
-    model = Value(codec.String(), "")
+    name = Value("", None, codec.String())
+    host = Value("", None, codec.String())
+    port = Port()
+    model = Value("", None, codec.String())
 
 
 # register interfaces
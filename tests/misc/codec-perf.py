@@ -1,9 +1,18 @@
 #! /usr/bin/env python3
 
+import ipaddress
 import json
+import os.path
+import sys
 import time
 
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), "../../lib")))
+
+from hpctinterfaces import codec
+from hpctinterfaces.codec import network
+
 COUNT = 500000
+CODEC_COUNT = 100000
 
 
 def encode(v: bool) -> str:
@@ -97,3 +106,39 @@ for i in range(COUNT):
     v = bbdecode(bbencode(True))
 t1 = time.time()
 print(f"predef list elapsed ({t1-t0})")
+
+
+#
+# codec encode/decode vs compiled (Codec.compile()) encode/decode
+#
+
+CODEC_VALUES = [
+    (codec.Boolean(), True),
+    (codec.Integer(), 12345),
+    (codec.Float(), 123.45),
+    (codec.Json(), {"partition": "batch", "nodes": ["n1", "n2"], "default": True}),
+    (codec.Blob(), b"x" * 64),
+    (network.IPAddress(), ipaddress.ip_address("10.20.30.40")),
+    (network.IPNetwork(), ipaddress.ip_network("10.20.0.0/16")),
+]
+
+for c, value in CODEC_VALUES:
+    name = c.__class__.__name__
+
+    t0 = time.time()
+    for i in range(CODEC_COUNT):
+        v = c.decode(c.encode(value))
+    t1 = time.time()
+    elapsed = t1 - t0
+
+    encode, decode = c.compile()
+    t0 = time.time()
+    for i in range(CODEC_COUNT):
+        v = decode(encode(value))
+    t1 = time.time()
+    compiled_elapsed = t1 - t0
+
+    print(
+        f"{name} codec elapsed ({elapsed:.3f}) compiled elapsed ({compiled_elapsed:.3f})"
+        f" speedup ({elapsed / compiled_elapsed:.2f}x)"
+    )
@@ -0,0 +1,58 @@
+#! /usr/bin/env python3
+#
+# compressedblob-perf.py
+#
+# Encoded size and encode/decode time of Blob vs CompressedBlob
+# (zlib, lzma) for config-like text and incompressible data.
+
+import os
+import os.path
+import sys
+import time
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), "../../lib")))
+
+from hpctinterfaces import codec
+
+COUNT = 5
+SIZES = [512, 64 * 1024, 1024 * 1024]
+
+CODECS = [
+    ("blob", codec.Blob()),
+    ("zlib", codec.CompressedBlob("zlib")),
+    ("lzma", codec.CompressedBlob("lzma")),
+]
+
+
+def make_text(size):
+    """Return slurm.conf-like text of size bytes."""
+
+    lines = []
+    i = 0
+    while sum(map(len, lines)) < size:
+        lines.append(
+            f"NodeName=node{i:05d} CPUs=64 Boards=1 SocketsPerBoard=2 CoresPerSocket=16"
+            f" ThreadsPerCore=2 RealMemory={256000 + i % 7} State=UNKNOWN\n"
+        )
+        i += 1
+    return "".join(lines).encode("utf-8")[:size]
+
+
+for kind, make in [("text", make_text), ("random", os.urandom)]:
+    for size in SIZES:
+        data = make(size)
+        for name, c in CODECS:
+            t0 = time.time()
+            for i in range(COUNT):
+                encoded = c.encode(data)
+            t1 = time.time()
+            for i in range(COUNT):
+                decoded = c.decode(encoded)
+            t2 = time.time()
+
+            print(
+                f"{kind} size ({size}) {name} encoded ({len(encoded)})"
+                f" ratio ({len(encoded) / size:.3f})"
+                f" encode ({(t1 - t0) / COUNT * 1000:.2f} ms)"
+                f" decode ({(t2 - t1) / COUNT * 1000:.2f} ms)"
+            )
@@ -0,0 +1,139 @@
+#! /usr/bin/env python3
+#
+# delta-perf.py
+#
+# Stored size and time of FileDataInterface.load_delta() vs load() for
+# typical edits of a large slurm.conf-like file, and the time to
+# rebuild the file from the delta (receiver). Sizes are of the values
+# written (changed) by the load; the (new) signature is kept in a local
+# file, not written, and its size is shown separately.
+#
+# Usage: delta-perf.py [<size-MB>]
+
+import os
+import os.path
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), "../../lib")))
+
+from hpctinterfaces.base import BaseInterface
+from hpctinterfaces.ext.file import FileDataInterface, get_signature_path
+
+MB = 1024 * 1024
+
+
+class FileInterface(BaseInterface):
+    file = FileDataInterface()
+
+
+def make_lines(size):
+    """Return slurm.conf-like lines, of size bytes in total."""
+
+    lines = []
+    total = 0
+    i = 0
+    while total < size:
+        line = (
+            f"NodeName=node{i:06d} CPUs=64 Boards=1 SocketsPerBoard=2 CoresPerSocket=16"
+            f" ThreadsPerCore=2 RealMemory={256000 + i % 7} State=UNKNOWN\n"
+        )
+        lines.append(line)
+        total += len(line)
+        i += 1
+    return lines
+
+
+def edit_lines(lines, count):
+    lines = lines[:]
+    for i in range(count):
+        j = random.randrange(len(lines))
+        lines[j] = lines[j].replace("State=UNKNOWN", "State=DRAIN Reason=maintenance")
+    return lines
+
+
+def insert_lines(lines, count):
+    lines = lines[:]
+    j = random.randrange(len(lines))
+    lines[j:j] = [f"# added {i}\n" for i in range(count)]
+    return lines
+
+
+def append_lines(lines, count):
+    return lines + [f"NodeName=extra{i:04d} CPUs=8 State=UNKNOWN\n" for i in range(count)]
+
+
+def written_size(before, after, key=None):
+    """Return size of values written (changed), optionally only for key."""
+
+    return sum(
+        len(v) for k, v in after.items() if before.get(k) != v and (key == None or k == key)
+    )
+
+
+def measure(name, lines, new_lines):
+    d = tempfile.mkdtemp()
+    src = os.path.join(d, "src")
+    dst = os.path.join(d, "dst")
+    sigpath = get_signature_path(src)
+    try:
+        with open(src, "w") as f:
+            f.write("".join(lines))
+
+        sender = FileInterface()
+        sender.file.load_delta(src)
+        receiver = FileInterface()
+        receiver._store = sender._store
+        receiver.file.save(dst)
+
+        with open(src, "w") as f:
+            f.write("".join(new_lines))
+
+        before = dict(sender._store)
+        t0 = time.time()
+        sender.file.load_delta(src)
+        t1 = time.time()
+        delta_size = written_size(before, sender._store)
+        signature_size = os.path.getsize(sigpath)
+
+        receiver.file.save(dst)
+        t2 = time.time()
+
+        full = FileInterface()
+        full.file.load(src, checksum=True)
+        t3 = time.time()
+        full_size = written_size({}, full._store)
+
+        if open(src, "rb").read() != open(dst, "rb").read():
+            raise Exception("rebuilt file differs")
+    finally:
+        for path in [src, dst, sigpath]:
+            if os.path.exists(path):
+                os.unlink(path)
+        os.rmdir(d)
+
+    print(
+        f"{name}: full ({full_size}) delta ({delta_size})"
+        f" (signature ({signature_size}))"
+        f" ratio ({delta_size / full_size:.5f})"
+        f" load ({(t3 - t2) * 1000:.0f} ms) load_delta ({(t1 - t0) * 1000:.0f} ms)"
+        f" rebuild ({(t2 - t1) * 1000:.0f} ms)"
+    )
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) * MB if len(sys.argv) > 1 else 50 * MB
+
+    random.seed(0)
+    lines = make_lines(size)
+    print(f"size ({size // MB} MB) lines ({len(lines)})")
+
+    measure("unchanged", lines, lines)
+    measure("edit 1 line", lines, edit_lines(lines, 1))
+    measure("edit 10 lines", lines, edit_lines(lines, 10))
+    measure("edit 100 lines", lines, edit_lines(lines, 100))
+    measure("insert 10 lines", lines, insert_lines(lines, 10))
+    measure("append 100 lines", lines, append_lines(lines, 100))
+    measure("edit 1% lines", lines, edit_lines(lines, len(lines) // 100))
@@ -0,0 +1,82 @@
+#! /usr/bin/env python3
+#
+# fileload-mem.py
+#
+# Peak (Python) memory, via tracemalloc, of FileDataInterface.load()
+# (single pass: read, checksum, encode by block) vs the whole-file
+# approach (read_bytes(), sha224, Blob encode).
+#
+# The whole-file approach needs ~20x the file size (base85 encoding
+# of the whole file at once), so it is measured on a smaller file.
+#
+# Usage: fileload-mem.py [<size-MB> [<whole-file-size-MB>]]
+
+import hashlib
+import os
+import os.path
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), "../../lib")))
+
+from hpctinterfaces import codec
+from hpctinterfaces.base import BaseInterface
+from hpctinterfaces.ext.file import FileDataInterface
+
+MB = 1024 * 1024
+
+
+class FileInterface(BaseInterface):
+    file = FileDataInterface()
+
+
+def make_file(size):
+    f = tempfile.NamedTemporaryFile(delete=False)
+    block = os.urandom(MB)
+    for i in range(size // MB):
+        f.write(block)
+    f.close()
+    return f.name
+
+
+def load_stream(path):
+    iface = FileInterface()
+    iface.file.load(path, checksum=True)
+    return iface
+
+
+def load_whole(path):
+    store = {}
+    data = open(path, "rb").read()
+    store["checksum"] = hashlib.sha224(data).hexdigest()
+    store["data"] = codec.Blob().encode(data)
+    return store
+
+
+def measure(name, func, size):
+    path = make_file(size)
+    try:
+        tracemalloc.start()
+        t0 = time.time()
+        result = func(path)
+        t1 = time.time()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result
+    finally:
+        os.unlink(path)
+
+    print(
+        f"{name} size ({size // MB} MB) peak ({peak / MB:.1f} MB)"
+        f" peak/size ({peak / size:.2f}) elapsed ({t1 - t0:.2f} s)"
+    )
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) * MB if len(sys.argv) > 1 else 256 * MB
+    whole_size = int(sys.argv[2]) * MB if len(sys.argv) > 2 else 16 * MB
+
+    measure("stream", load_stream, size)
+    measure("whole", load_whole, whole_size)
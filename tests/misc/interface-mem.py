@@ -0,0 +1,50 @@
+#! /usr/bin/env python3
+#
+# interface-mem.py
+#
+# Per-instance memory of unit bucket interfaces, as materialized by
+# RelationSuperInterface.select(). The library interfaces use
+# __slots__; the "dict" variant is a subclass without __slots__ (as
+# charm code would usually define one) with its instance __dict__ in
+# use.
+
+import os.path
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), "../../lib")))
+
+from hpctinterfaces.relation import RelationSuperInterface, UnitBucketInterface
+
+COUNT = 10000
+
+
+class DictUnitBucketInterface(UnitBucketInterface):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__dict__["_unused"] = None
+
+
+class Charm:
+    model = None
+
+
+def measure(interface_cls):
+    siface = RelationSuperInterface(Charm(), "relation", role="provider")
+    siface.interface_classes[("provider", "unit")] = interface_cls
+
+    tracemalloc.start()
+    ifaces = [siface.select("unit") for i in range(COUNT)]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return current / len(ifaces)
+
+
+slots_size = measure(UnitBucketInterface)
+dict_size = measure(DictUnitBucketInterface)
+
+print(f"interfaces ({COUNT})")
+print(f"slots bytes/interface ({slots_size:.1f})")
+print(f"dict bytes/interface ({dict_size:.1f})")
+print(f"saved bytes/interface ({dict_size - slots_size:.1f})")
@@ -0,0 +1,96 @@
+#! /usr/bin/env python3
+#
+# json-perf.py
+#
+# Encode/decode time of the JSON backends (json, orjson, ujson; those
+# installed) and of codec.Json (default and canonical) for config-like
+# dicts (slurm nodes/partitions, as a charm would publish).
+
+import json
+import os.path
+import sys
+import time
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), "../../lib")))
+
+from hpctinterfaces import codec
+
+COUNT = 20
+SIZES = [10, 100, 1000, 10000]
+
+
+def make_config(nnodes):
+    """Return slurm-like config dict for nnodes nodes."""
+
+    nodes = {
+        f"node{i:05d}": {
+            "boards": 1,
+            "cores_per_socket": 16,
+            "cpus": 64,
+            "features": ["avx2", "ib"] if i % 2 else ["avx512"],
+            "gres": [{"count": 4, "name": "gpu", "type": "a100"}] if i % 8 == 0 else [],
+            "real_memory": 256000 + i % 7,
+            "sockets_per_board": 2,
+            "state": "UNKNOWN",
+            "threads_per_core": 2,
+            "weight": 1.0 + (i % 3) / 10,
+        }
+        for i in range(nnodes)
+    }
+    partitions = {
+        f"part{i}": {
+            "default": i == 0,
+            "max_time": "7-00:00:00",
+            "nodes": sorted(nodes)[i::4],
+            "state": "UP",
+        }
+        for i in range(4)
+    }
+    return {"cluster": "hpc", "nodes": nodes, "partitions": partitions}
+
+
+def get_backends():
+    backends = [
+        ("json", json.dumps, json.loads),
+        ("json-canonical", lambda v: json.dumps(v, separators=(",", ":"), sort_keys=True), None),
+    ]
+    try:
+        import orjson
+
+        backends.append(("orjson", lambda v: orjson.dumps(v).decode("utf-8"), orjson.loads))
+    except ImportError:
+        pass
+    try:
+        import ujson
+
+        backends.append(("ujson", ujson.dumps, ujson.loads))
+    except ImportError:
+        pass
+
+    backends.append(("codec.Json", codec.Json().encode, codec.Json().decode))
+    backends.append(
+        ("codec.Json-canonical", codec.Json(canonical=True).encode, codec.Json().decode)
+    )
+    return backends
+
+
+def timeit(func, arg, count):
+    t0 = time.time()
+    for i in range(count):
+        result = func(arg)
+    return (time.time() - t0) / count, result
+
+
+if __name__ == "__main__":
+    print(f"backend ({codec.JSON_BACKEND})")
+
+    for nnodes in SIZES:
+        config = make_config(nnodes)
+        count = max(1, COUNT * SIZES[-1] // nnodes // 10)
+        for name, dumps, loads in get_backends():
+            dumps_time, s = timeit(dumps, config, count)
+            line = f"nodes ({nnodes}) {name} size ({len(s)}) dumps ({dumps_time * 1000:.3f} ms)"
+            if loads:
+                loads_time, _ = timeit(loads, s, count)
+                line += f" loads ({loads_time * 1000:.3f} ms)"
+            print(line)
@@ -0,0 +1,11 @@
+# Copyright 2022 Canonical Ltd.
+# See LICENSE file for licensing details.
+#
+# tests/unit/conftest.py
+
+"""Unit test (pytest) setup, as for tox -e unit: lib/ on the module path."""
+
+import os.path
+import sys
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), "../../lib")))
@@ -0,0 +1,220 @@
+# Copyright 2022 Canonical Ltd.
+# See LICENSE file for licensing details.
+#
+# tests/unit/test_base.py
+
+import json
+
+import pytest
+from hpctinterfaces.base import BaseInterface, Interface, NoValue
+from hpctinterfaces.checker import CheckError, IntegerRange
+from hpctinterfaces.value import Integer, String
+
+
+class RecordingStore:
+    """Store (as BucketStore) which records each update."""
+
+    def __init__(self):
+        self.data = {}
+        self.updates = []
+
+    def __delitem__(self, key):
+        """Delete key (as one update)."""
+        self.update({key: NoValue})
+
+    def __setitem__(self, key, value):
+        """Set key (as one update)."""
+        self.update({key: value})
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def get_many(self, keys):
+        return {key: self.data.get(key, NoValue) for key in keys}
+
+    def update(self, d):
+        self.updates.append(dict(d))
+        for k, v in d.items():
+            if v is NoValue:
+                self.data.pop(k, None)
+            else:
+                self.data[k] = v
+
+
+class NodeInterface(Interface):
+    partition = String("")
+    weight = Integer(1, IntegerRange(1, 100))
+
+
+class ConfigInterface(BaseInterface):
+    name = String("")
+    node = NodeInterface()
+    size = Integer(0)
+
+
+@pytest.fixture
+def iface():
+    iface = ConfigInterface()
+    iface._store = RecordingStore()
+    return iface
+
+
+def test_batch_single_update(iface):
+    with iface.batch():
+        iface.name = "slurm.conf"
+        iface.size = 1024
+        iface.node.weight = 10
+
+        # visible in the batch, not yet in the store
+        assert (iface.name, iface.size, iface.node.weight) == ("slurm.conf", 1024, 10)
+        assert iface._store.updates == []
+
+    assert iface._store.updates == [{"name": "slurm.conf", "size": "1024", "node.weight": "10"}]
+    assert (iface.name, iface.size, iface.node.weight) == ("slurm.conf", 1024, 10)
+
+
+def test_batch_rollback(iface):
+    iface.name = "old"
+    iface.size = 10
+    iface.node.weight = 5
+    nupdates = len(iface._store.updates)
+
+    with pytest.raises(CheckError):
+        with iface.batch():
+            iface.name = "new"
+            iface.clear("size")
+            assert (iface.name, iface.size) == ("new", 0)
+            iface.node.weight = 500
+
+    # no writes, and no (cached) values from the batch
+    assert len(iface._store.updates) == nupdates
+    assert iface._store.data == {"name": "old", "size": "10", "node.weight": "5"}
+    assert (iface.name, iface.size, iface.node.weight) == ("old", 10, 5)
+    assert iface._pending is None
+
+
+def test_batch_rollback_dict_store():
+    iface = ConfigInterface()
+    iface.name = "old"
+    store = dict(iface._store)
+
+    with pytest.raises(Exception, match="fail"):
+        with iface.batch():
+            iface.name = "new"
+            iface.size = 10
+            raise Exception("fail")
+
+    assert iface._store == store
+    assert (iface.name, iface.size) == ("old", 0)
+
+
+def test_batch_nested(iface):
+    with iface.batch():
+        iface.name = "a"
+        with iface.node.batch():
+            iface.node.partition = "batch"
+        assert iface._store.updates == []
+
+    assert iface._store.updates == [{"name": "a", "node.partition": "batch"}]
+
+
+def test_batch_nested_rollback(iface):
+    with pytest.raises(Exception, match="fail"):
+        with iface.batch():
+            iface.name = "a"
+            with iface.node.batch():
+                iface.node.partition = "batch"
+                raise Exception("fail")
+
+    assert iface._store.updates == []
+    assert (iface.name, iface.node.partition) == ("", "")
+
+
+def test_batch_clear(iface):
+    iface.name = "a"
+    with iface.batch():
+        iface.clear("name")
+        assert iface.name == ""
+
+    assert iface._store.updates[-1] == {"name": NoValue}
+    assert "name" not in iface._store.data
+
+
+class PackedInterface(BaseInterface):
+    _packed = "packed"
+
+    name = String("")
+    node = NodeInterface()
+    size = Integer(0)
+
+
+@pytest.fixture
+def packed():
+    iface = PackedInterface()
+    iface._store = RecordingStore()
+    return iface
+
+
+def test_packed_round_trip(packed):
+    packed.name = "slurm.conf"
+    packed.size = 1024
+    packed.node.weight = 10
+
+    # one document, of raw values
+    assert list(packed._store.data) == ["packed"]
+    assert json.loads(packed._store.data["packed"]) == {
+        "name": "slurm.conf",
+        "node.weight": "10",
+        "size": "1024",
+    }
+
+    # as read by another unit
+    other = PackedInterface()
+    other._store = {"packed": packed._store.data["packed"]}
+    assert (other.name, other.size, other.node.weight) == ("slurm.conf", 1024, 10)
+    assert other.node.partition == ""
+    assert other.snapshot()._asdict() == {
+        "name": "slurm.conf",
+        "node": {"partition": "", "weight": 10},
+        "size": 1024,
+    }
+
+
+def test_packed_batch(packed):
+    with packed.batch():
+        packed.name = "a"
+        packed.node.partition = "batch"
+        assert (packed.name, packed.node.partition) == ("a", "batch")
+        assert packed.snapshot().name == "a"
+        assert packed._store.updates == []
+
+    assert packed._store.updates == [{"packed": '{"name":"a","node.partition":"batch"}'}]
+
+
+def test_packed_rollback(packed):
+    packed.name = "old"
+    nupdates = len(packed._store.updates)
+    raw = packed._store.data["packed"]
+
+    with pytest.raises(CheckError):
+        with packed.batch():
+            packed.name = "new"
+            packed.size = 10
+            packed.node.weight = 500
+
+    assert len(packed._store.updates) == nupdates
+    assert packed._store.data == {"packed": raw}
+    assert (packed.name, packed.size) == ("old", 0)
+
+
+def test_packed_clear(packed):
+    packed.name = "a"
+    packed.size = 1
+    packed.clear("name")
+    assert packed.name == ""
+    assert json.loads(packed._store.data["packed"]) == {"size": "1"}
+
+    # empty document is deleted
+    packed.clear("size")
+    assert packed._store.updates[-1] == {"packed": NoValue}
+    assert packed._store.data == {}
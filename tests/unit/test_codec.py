@@ -0,0 +1,103 @@
+# Copyright 2022 Canonical Ltd.
+# See LICENSE file for licensing details.
+#
+# tests/unit/test_codec.py
+
+import json
+
+import pytest
+from hpctinterfaces import codec
+from hpctinterfaces.base import BaseInterface, BatchError, NoValue, Value
+from hpctinterfaces.checker import CheckError, IntegerRange
+
+
+class Upper(codec.String):
+    """String, encoded in upper case."""
+
+    def encode(self, value: str) -> str:
+        return super().encode(value).upper()
+
+
+class Duck:
+    """Codec (not a Codec subclass) without compile()."""
+
+    def decode(self, value: str) -> int:
+        return int(value)
+
+    def encode(self, value: int) -> str:
+        return str(value)
+
+
+class CodecInterface(BaseInterface):
+    count = Value(0, IntegerRange(0, 10), Duck())
+    name = Value("", None, Upper())
+
+
+def test_fastpath_inheritance():
+    assert codec.String.fastpath
+    assert not Upper.fastpath
+
+    # overrides only _encode()/_decode(), or inherits
+    assert codec.CompressedBlob.fastpath
+    assert codec.Ready.fastpath
+
+
+def test_fastpath_override_used():
+    encode, decode = Upper().compile()
+    assert encode("abc") == "ABC"
+
+    iface = CodecInterface()
+    iface.name = "abc"
+    assert iface._store["name"] == "ABC"
+
+
+def test_bulk_decode_inheritance():
+    assert codec.Integer.bulk_decode == int
+
+    class Hex(codec.Integer):
+        def _decode(self, value: str) -> int:
+            return int(value, 16)
+
+    assert Hex.fastpath
+    assert Hex.bulk_decode == None
+    assert Value(0, None, Hex()).decode_many(["10"]) == [16]
+
+
+def test_bulk_decode():
+    value = Value(-1, IntegerRange(0, 10), codec.Integer())
+    raws = ["1", NoValue, "5", "1"]
+    assert value._bulk_decode != None
+    assert value.decode_many(raws) == [value.decode(raw) for raw in raws] == [1, -1, 5, 1]
+
+    with pytest.raises(BatchError) as excinfo:
+        value.decode_many(["1", "50", "x"])
+    assert excinfo.value.results == [1, None, None]
+    assert isinstance(excinfo.value.errors[1], CheckError)
+    assert isinstance(excinfo.value.errors[2], ValueError)
+
+
+def test_duck_typed_codec():
+    iface = CodecInterface()
+    iface.count = 5
+    assert iface._store["count"] == "5"
+    assert iface.count == 5
+
+    with pytest.raises(CheckError):
+        iface.count = 50
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {"b": 1, "a": [1.5, True, None, "x"], "c": {"z": "", "y": -0.0}},
+        {"floats": [1e16, 1e15, 1e-05, 0.0001, 5e-324, 1.7976931348623157e308]},
+        {"nan": float("nan"), "inf": float("-inf")},
+        {"text": 'é \x7f\x1f"\\/\n', "node-1": "1e5 null"},
+        {"big": 2**70},
+        {2: "int key", 1: "int key"},
+    ],
+)
+def test_json_canonical(value):
+    # same as json (stdlib), whichever the backend
+    expected = json.dumps(value, separators=(",", ":"), sort_keys=True)
+    assert codec.Json(canonical=True).encode(value) == expected
@@ -0,0 +1,405 @@
+# Copyright 2022 Canonical Ltd.
+# See LICENSE file for licensing details.
+#
+# tests/unit/test_file.py
+
+import os
+import stat
+
+import pytest
+from hpctinterfaces.base import BaseInterface, NoValue
+from hpctinterfaces.ext.file import (
+    FileAckInterface,
+    FileDataInterface,
+    FileSetInterface,
+    format_ranges,
+    get_file_checksum,
+    get_signature_path,
+    parse_ranges,
+)
+
+CHUNKSIZE = 1024
+
+
+# sub-interfaces are shared by instances of a class, so the sender and
+# receiver (in one process) have their own classes
+class SenderInterface(BaseInterface):
+    file = FileDataInterface()
+    files = FileSetInterface()
+
+
+class ReceiverInterface(BaseInterface):
+    ack = FileAckInterface()
+    file = FileDataInterface()
+    files = FileSetInterface()
+
+
+def make_file(path, size, seed=0):
+    contents = bytes((seed + i * 7) % 251 for i in range(size))
+    path.write_bytes(contents)
+    return contents
+
+
+def receive(sender, path, *args):
+    """Receive chunks from the sender (as in a receiver hook)."""
+    receiver = ReceiverInterface()
+    receiver._store = dict(sender._store)
+    have, complete = receiver.file.receive_chunks(path, *args)
+    return receiver, have, complete
+
+
+def get_mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_chunks_resend_ack(tmp_path):
+    src = tmp_path / "src"
+    dst = tmp_path / "dst"
+    contents = make_file(src, 5 * CHUNKSIZE + 100)
+
+    sender = SenderInterface()
+    pending = sender.file.load_chunks(src, chunksize=CHUNKSIZE, limit=2)
+    assert pending == {2, 3, 4, 5}
+
+    hooks = 0
+    while True:
+        hooks += 1
+        receiver, have, complete = receive(sender, dst, 0o640)
+        if complete:
+            break
+        assert not dst.exists()
+        assert get_mode(f"{dst}.part") == 0o600
+
+        # receiver acks, sender sends the rest (only)
+        ack = receiver.ack
+        ack.nonce = sender.file.nonce
+        ack.chunks = format_ranges(have)
+        have = parse_ranges(ack.chunks) if ack.nonce == sender.file.nonce else set()
+        pending = sender.file.load_chunks(src, chunksize=CHUNKSIZE, have=have, limit=2)
+        stored = [k for k in sender._store if "chunk-" in k and sender._store[k] != ""]
+        assert len(stored) <= 2
+        assert not any(f"chunk-{i}" in k for i in have for k in stored)
+
+    assert hooks == 3
+    assert dst.read_bytes() == contents
+    assert get_mode(dst) == 0o640
+    assert not os.path.exists(f"{dst}.part")
+
+
+def test_chunks_update(tmp_path):
+    src = tmp_path / "src"
+    dst = tmp_path / "dst"
+    contents = bytearray(make_file(src, 4 * CHUNKSIZE))
+
+    sender = SenderInterface()
+    sender.file.load_chunks(src, chunksize=CHUNKSIZE)
+    _, have, complete = receive(sender, dst)
+    assert complete
+    os.chmod(dst, 0o604)
+
+    # only the changed chunk is stored; the rest comes from the old file
+    contents[CHUNKSIZE + 10] ^= 0xFF
+    src.write_bytes(contents)
+    sender.file.load_chunks(src, chunksize=CHUNKSIZE, have=have)
+    stored = [k for k in sender._store if "chunk-" in k and sender._store[k] != ""]
+    assert stored == ["file.chunk-1"]
+
+    _, have, complete = receive(sender, dst)
+    assert complete
+    assert dst.read_bytes() == contents
+    assert get_mode(dst) == 0o604
+
+
+def test_chunks_complete(tmp_path):
+    src = tmp_path / "src"
+    dst = tmp_path / "dst"
+    make_file(src, 3 * CHUNKSIZE + 100)
+
+    sender = SenderInterface()
+    sender.file.load_chunks(src, chunksize=CHUNKSIZE)
+    _, have, complete = receive(sender, dst)
+    assert complete
+    inode = os.stat(dst).st_ino
+
+    # already complete: not rewritten, mode set
+    _, have, complete = receive(sender, dst, 0o640)
+    assert (have, complete) == ({0, 1, 2, 3}, True)
+    assert os.stat(dst).st_ino == inode
+    assert get_mode(dst) == 0o640
+    assert not os.path.exists(f"{dst}.part")
+
+
+def test_chunks_bad_part(tmp_path):
+    src = tmp_path / "src"
+    dst = tmp_path / "dst"
+    contents = make_file(src, 3 * CHUNKSIZE)
+
+    sender = SenderInterface()
+    sender.file.load_chunks(src, chunksize=CHUNKSIZE)
+
+    # (stale) partial file with a bad chunk, accessible to others
+    part = tmp_path / "dst.part"
+    part.write_bytes(b"x" * CHUNKSIZE + contents[CHUNKSIZE:])
+    os.chmod(part, 0o644)
+
+    _, have, complete = receive(sender, dst)
+    assert complete
+    assert dst.read_bytes() == contents
+
+
+def test_load_clears_chunks(tmp_path):
+    src = tmp_path / "src"
+    make_file(src, 3 * CHUNKSIZE)
+
+    sender = SenderInterface()
+    sender.file.load_chunks(src, chunksize=CHUNKSIZE)
+    sender.file.load(src)
+    assert [k for k in sender._store if "chunk-" in k or "manifest" in k] == []
+
+    sender.file.load_chunks(src, chunksize=CHUNKSIZE)
+    sender.file.load_delta(src)
+    assert [k for k in sender._store if "chunk-" in k or "manifest" in k] == []
+
+    # nothing to receive
+    _, have, complete = receive(sender, tmp_path / "dst")
+    assert (have, complete) == (set(), False)
+
+
+def test_chunks_no_chunks(tmp_path):
+    sender = SenderInterface()
+    with pytest.raises(Exception, match="path does not exist"):
+        sender.file.load_chunks(tmp_path / "missing")
+
+
+def save(sender, path, *args):
+    """Save file from the sender, as in a receiver hook."""
+    receiver = ReceiverInterface()
+    receiver._store = dict(sender._store)
+    written = receiver.file.save(path, *args)
+    return written, get_file_checksum(path) or ""
+
+
+def change(path, contents, i):
+    contents = bytearray(contents)
+    contents[i] ^= 0xFF
+    path.write_bytes(contents)
+    return bytes(contents)
+
+
+def test_delta_apply(tmp_path):
+    src = tmp_path / "src"
+    dst = tmp_path / "dst"
+    contents = make_file(src, 64 * 1024)
+
+    sender = SenderInterface()
+    sender.file.load_delta(src, blocksize=1024)
+    assert sender.file.delta == NoValue
+    assert save(sender, dst)[0]
+
+    contents = change(src, contents, 1000)
+    sender.file.load_delta(src, blocksize=1024)
+    assert sender.file.delta != NoValue
+    assert len(sender.file.data) < 2048
+    assert save(sender, dst)[0]
+    assert dst.read_bytes() == contents
+
+    # already up to date
+    assert not save(sender, dst)[0]
+
+
+def test_delta_signature_local(tmp_path):
+    src = tmp_path / "src"
+    sigpath = tmp_path / "sig"
+    contents = make_file(src, 64 * 1024)
+
+    sender = SenderInterface()
+    sender.file.load_delta(src, blocksize=1024, sigpath=sigpath)
+    assert sigpath.exists() and not get_signature_path(src).exists()
+    assert get_mode(sigpath) == 0o600
+    assert not [k for k in sender._store if "signature" in k]
+
+    # signature for another version: whole file
+    contents = change(src, contents, 1000)
+    sender.file.load(src)
+    change(src, contents, 2000)
+    sender.file.load_delta(src, blocksize=1024, sigpath=sigpath)
+    assert sender.file.delta == NoValue
+
+    # missing signature: whole file
+    sigpath.unlink()
+    change(src, contents, 3000)
+    sender.file.load_delta(src, blocksize=1024, sigpath=sigpath)
+    assert sender.file.delta == NoValue
+    assert sigpath.exists()
+
+
+def test_delta_base_mismatch(tmp_path):
+    src = tmp_path / "src"
+    dst = tmp_path / "dst"
+    contents = make_file(src, 64 * 1024)
+    dst.write_bytes(b"other")
+
+    sender = SenderInterface()
+    sender.file.load_delta(src, blocksize=1024)
+    change(src, contents, 1000)
+    sender.file.load_delta(src, blocksize=1024)
+    with pytest.raises(Exception, match="delta base mismatch"):
+        save(sender, dst)
+    assert dst.read_bytes() == b"other"
+
+
+def test_delta_bases(tmp_path):
+    src = tmp_path / "src"
+    dst = tmp_path / "dst"
+    new = tmp_path / "new"
+    contents = make_file(src, 64 * 1024)
+
+    sender = SenderInterface()
+    sender.file.load_delta(src, blocksize=1024)
+    _, base = save(sender, dst)
+
+    # receiver at the previous version: delta
+    contents = change(src, contents, 1000)
+    sender.file.load_delta(src, blocksize=1024, bases=[base])
+    assert sender.file.delta != NoValue
+
+    # (unchanged) new receiver without the file: whole file
+    sender.file.load_delta(src, blocksize=1024, bases=[base, ""])
+    assert sender.file.delta == NoValue
+    _, base = save(sender, dst)
+    _, new_base = save(sender, new)
+    assert base == new_base == sender.file.checksum
+
+    # receiver which missed a version (coalesced changes): whole file
+    change(src, contents, 2000)
+    sender.file.load_delta(src, blocksize=1024, bases=[base])
+    assert sender.file.delta != NoValue
+    contents = change(src, contents, 3000)
+    sender.file.load_delta(src, blocksize=1024, bases=[base, new_base])
+    assert sender.file.delta == NoValue
+    save(sender, dst)
+    save(sender, new)
+    assert dst.read_bytes() == new.read_bytes() == contents
+
+
+def test_load_checksum(tmp_path):
+    src = tmp_path / "src"
+    src2 = tmp_path / "src2"
+    make_file(src, 1000)
+    contents = make_file(src2, 1000, seed=1)
+
+    sender = SenderInterface()
+    sender.file.load(src, checksum=True)
+    sender.file.load(src2)
+    assert sender.file.checksum == get_file_checksum(src2)
+
+    sender.file.load_chunks(src, chunksize=CHUNKSIZE)
+    sender.file.load(src2)
+    assert sender.file.checksum == get_file_checksum(src2)
+
+    dst = tmp_path / "dst"
+    make_file(dst, 1000)
+    assert save(sender, dst)[0]
+    assert dst.read_bytes() == contents
+
+
+def test_save_skip(tmp_path):
+    src = tmp_path / "src"
+    dst = tmp_path / "dst"
+    contents = make_file(src, 1000)
+
+    sender = SenderInterface()
+    sender.file.load(src)
+    assert save(sender, dst, 0o640)[0]
+    assert get_mode(dst) == 0o640
+
+    # same contents: not written, but mode set
+    inode = os.stat(dst).st_ino
+    assert not save(sender, dst, 0o600)[0]
+    assert get_mode(dst) == 0o600
+    assert os.stat(dst).st_ino == inode
+    assert dst.read_bytes() == contents
+
+
+def test_save_atomic(tmp_path):
+    src = tmp_path / "src"
+    dst = tmp_path / "dst"
+    contents = make_file(src, 1000)
+    dst.write_bytes(b"old")
+    os.chmod(dst, 0o604)
+    inode = os.stat(dst).st_ino
+
+    sender = SenderInterface()
+    sender.file.load(src)
+    assert save(sender, dst)[0]
+
+    # new file (renamed over the old one), with the mode of the old one
+    assert dst.read_bytes() == contents
+    assert os.stat(dst).st_ino != inode
+    assert get_mode(dst) == 0o604
+    assert sorted(os.listdir(tmp_path)) == ["dst", "src"]
+
+
+def test_save_mode_new(tmp_path):
+    src = tmp_path / "src"
+    make_file(src, 1000)
+
+    sender = SenderInterface()
+    sender.file.load(src)
+    save(sender, tmp_path / "dst", 0o400)
+    assert get_mode(tmp_path / "dst") == 0o400
+
+    umask = os.umask(0o027)
+    try:
+        save(sender, tmp_path / "dst2")
+    finally:
+        os.umask(umask)
+    assert get_mode(tmp_path / "dst2") == 0o640
+
+
+def save_set(sender, *args, **kwargs):
+    """Save file set from the sender, as in a receiver hook."""
+    receiver = ReceiverInterface()
+    receiver._store = dict(sender._store)
+    return receiver.files.save(*args, **kwargs)
+
+
+def test_file_set_load_errors(tmp_path):
+    a = tmp_path / "a"
+    b = tmp_path / "b"
+    missing = tmp_path / "missing"
+    make_file(a, 100)
+    contents = make_file(b, 100, seed=1)
+
+    sender = SenderInterface()
+    errors = sender.files.load([a, b, missing])
+    assert list(errors) == [str(missing)]
+    assert sender.files.get_paths() == [str(a), str(b)]
+
+    # a file which fails to load keeps its previous values
+    b.unlink()
+    errors = sender.files.load([a, b])
+    assert list(errors) == [str(b)]
+    assert sender.files.get_paths() == [str(a), str(b)]
+    assert sender.files.get_file(b).data == contents
+
+
+def test_file_set_save_errors(tmp_path):
+    a = tmp_path / "a"
+    b = tmp_path / "b"
+    contents = make_file(a, 100)
+    make_file(b, 100)
+
+    sender = SenderInterface()
+    assert sender.files.load([a, b]) == {}
+
+    # (receiver) a is changed, b cannot be written
+    a.write_bytes(b"changed")
+    b.unlink()
+    b.mkdir()
+
+    written, errors = save_set(sender, [a, b, tmp_path / "c"])
+    assert written == [str(a)]
+    assert list(errors) == [str(b), str(tmp_path / "c")]
+    assert "not in file set" in str(errors[str(tmp_path / "c")])
+    assert a.read_bytes() == contents
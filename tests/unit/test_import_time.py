@@ -0,0 +1,77 @@
+# Copyright 2022 Canonical Ltd.
+# See LICENSE file for licensing details.
+#
+# tests/unit/test_import_time.py
+
+"""Import-time regression tests for "import hpctinterfaces".
+
+The import is paid by every hook: its cumulative time, as reported by
+"python -X importtime", must be within budget, and modules which should
+be imported lazily must not be pulled in.
+"""
+
+import os.path
+import subprocess
+import sys
+
+import pytest
+
+# usec; overridden by HPCTINTERFACES_IMPORT_BUDGET (e.g., for slow CI runners)
+BUDGET = int(os.environ.get("HPCTINTERFACES_IMPORT_BUDGET", 50000))
+LAZY_MODULES = [
+    "hpctinterfaces.codec",
+    "hpctinterfaces.ext",
+    "hpctinterfaces.relation",
+    "hpctinterfaces.store",
+    "hpctinterfaces.value",
+    "importlib.metadata",
+    "ipaddress",
+    "ops",
+]
+RUNS = 5
+
+LIBDIR = os.path.realpath(os.path.join(os.path.dirname(__file__), "../../lib"))
+
+
+def importtime():
+    """Return (cumulative time in usec, imported module names)."""
+    cp = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import hpctinterfaces"],
+        capture_output=True,
+        cwd=LIBDIR,
+        check=True,
+        text=True,
+    )
+
+    total = None
+    modules = []
+    for line in cp.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[12:].split("|")
+        name = name.strip()
+        modules.append(name)
+        if name == "hpctinterfaces":
+            total = int(cumulative)
+    return total, modules
+
+
+@pytest.fixture(scope="module")
+def results():
+    return [importtime() for i in range(RUNS)]
+
+
+def test_import_time(results):
+    # best of, to limit noise
+    total = min(total for total, _ in results)
+    assert total <= BUDGET, f"import time ({total} usec) over budget ({BUDGET} usec)"
+
+
+def test_lazy_modules(results):
+    modules = results[0][1]
+    lazy = [
+        name
+        for name in modules
+        if any(name == lazyname or name.startswith(f"{lazyname}.") for lazyname in LAZY_MODULES)
+    ]
+    assert lazy == []
@@ -0,0 +1,34 @@
+# Copyright 2022 Canonical Ltd.
+# See LICENSE file for licensing details.
+#
+# tests/unit/test_message.py
+
+import pytest
+from hpctinterfaces.base import BaseInterface
+from hpctinterfaces.checker import CheckError
+from hpctinterfaces.ext.message import MessageInterface
+
+
+class MessageBaseInterface(BaseInterface):
+    msg = MessageInterface()
+
+
+def test_unset():
+    iface = MessageBaseInterface()
+    assert iface.msg.dtype == ""
+    assert dict(iface.msg.get_items())["dtype"] == ""
+    assert iface.msg.snapshot().dtype == ""
+
+
+def test_dtype():
+    iface = MessageBaseInterface()
+    iface.msg.dtype = "t"
+    assert iface.msg.dtype == "t"
+
+    with pytest.raises(CheckError):
+        iface.msg.dtype = "x"
+
+    # bad stored value
+    iface._store["msg.dtype"] = "x"
+    with pytest.raises(CheckError):
+        iface.msg.dtype
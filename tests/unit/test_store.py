@@ -0,0 +1,104 @@
+# Copyright 2022 Canonical Ltd.
+# See LICENSE file for licensing details.
+#
+# tests/unit/test_store.py
+
+from hpctinterfaces.store import BucketStore, get_relation_cache
+
+
+class FakeRelation:
+    def __init__(self, relation_id):
+        self.id = relation_id
+        self.data = {"app": {}}
+
+
+class FakeModel:
+    def __init__(self):
+        self.relations = {"slurmd": []}
+
+    def get_relation(self, relname, relation_id=None):
+        for relation in self.relations.get(relname, []):
+            if relation_id in [None, relation.id]:
+                return relation
+
+
+class FakeUnit:
+    def __init__(self):
+        self.leader = False
+
+    def is_leader(self):
+        return self.leader
+
+
+class FakeCharm:
+    def __init__(self):
+        self.model = FakeModel()
+        self.unit = FakeUnit()
+
+
+def test_not_cached_by_default():
+    # as with a long-lived charm object (e.g., Harness)
+    charm = FakeCharm()
+    cache = get_relation_cache(charm)
+    store = BucketStore(charm, "slurmd", "app")
+    assert store.get_relations() == []
+    assert not cache.is_leader()
+
+    relation = FakeRelation(1)
+    charm.model.relations["slurmd"].append(relation)
+    charm.unit.leader = True
+    assert store.get_relations() == [relation]
+    assert store.get_relation() is relation
+    assert cache.is_leader()
+
+
+def test_enabled():
+    charm = FakeCharm()
+    cache = get_relation_cache(charm)
+    cache.enable()
+    relation = FakeRelation(1)
+    charm.model.relations["slurmd"].append(relation)
+    assert cache.get_relations("slurmd") == [relation]
+    assert not cache.is_leader()
+
+    charm.model.relations["slurmd"].append(FakeRelation(2))
+    charm.unit.leader = True
+    assert cache.get_relations("slurmd") == [relation]
+    assert not cache.is_leader()
+
+    cache.invalidate()
+    assert len(cache.get_relations("slurmd")) == 2
+    assert cache.is_leader()
+
+    cache.disable()
+    charm.model.relations["slurmd"].pop()
+    assert cache.get_relations("slurmd") == [relation]
+
+
+def test_get_relations_copy():
+    charm = FakeCharm()
+    cache = get_relation_cache(charm)
+    cache.enable()
+    relation = FakeRelation(1)
+    charm.model.relations["slurmd"].append(relation)
+
+    cache.get_relations("slurmd").append(FakeRelation(2))
+    assert cache.get_relations("slurmd") == [relation]
+    cache.get_relations("slurmd").clear()
+    assert cache.get_relations("slurmd") == [relation]
+
+
+def test_attribute_keys():
+    charm = FakeCharm()
+    relation = FakeRelation(1)
+    charm.model.relations["slurmd"].append(relation)
+    store = BucketStore(charm, "slurmd", "app")
+
+    store.update({"ingress_address": "10.0.0.1"})
+    store["node-name"] = "node1"
+    assert relation.data["app"] == {"ingress-address": "10.0.0.1", "node-name": "node1"}
+    assert store["ingress_address"] == store.get("ingress-address") == "10.0.0.1"
+    assert store.get_many(["ingress_address", "node_name"]) == {
+        "ingress_address": "10.0.0.1",
+        "node_name": "node1",
+    }